@@ -1,83 +1,67 @@
 import customtkinter
+import logging
 from tkinter import *
 from datetime import datetime
 from datetime import timedelta
-import fastf1
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import (
-    FigureCanvasTkAgg)
-import fastf1.plotting
-from fastf1 import utils
-import requests
-import os
-import pandas as pd
-
-# Fast F1
-fastf1.Cache.enable_cache("./cache")
+import threading
+import profiling
+import season_index
+import tasks
+
+log = logging.getLogger("f1app")
+
+# Heavy modules are only imported once a frame needs them
+fastf1 = None
+matplotlib = None
+analysis = None
+degradation = None
+live = None
+pd = None
+plotting = None
+predictor = None
+prefetch = None
+results_table = None
+telemetry = None
+track_map = None
+plotTheme = None
+
+modulesLock = threading.Lock()
 
 drivers = []
 races = []
 
 
-def get_drivers():
-    if os.path.exists("drivers.txt"):
-        date_created = os.path.getctime("drivers.txt")
+def load_modules():
+    global fastf1, matplotlib, analysis, degradation, live, pd, plotting, predictor, prefetch, results_table, telemetry, track_map, plotTheme
 
-        if datetime.fromtimestamp(date_created).year != datetime.today().year:
-            DriverAPI()
-        else:
-            with open(file="drivers.txt", mode='r') as f:
-                for line in f:
-                    drivers.append(line)
-    else:
-        DriverAPI()
+    with modulesLock:
+        if analysis is not None:
+            return
 
+        import fastf1
+        import fastf1.plotting
+        import matplotlib
+        import degradation
+        import plotting
+        import live
+        import pandas as pd
+        import prefetch
+        import predictor
+        import results_table
+        import telemetry
+        import track_map
+        import analysis as analysisModule
 
-def get_races():
-    if os.path.exists("races.txt"):
-        date_created = os.path.getctime("races.txt")
+        # Fast F1
+        analysisModule.enable_cache()
+        # Plot theme
+        plotTheme = plotting.dark_theme(secondary_bg, text_color)
+        analysis = analysisModule
 
-        if datetime.fromtimestamp(date_created).year != datetime.today().year:
-            RaceAPI()
-        else:
-            with open(file="races.txt", mode='r') as f:
-                for line in f:
-                    races.append(line)
-    else:
-        RaceAPI()
 
+def get_season(year=None):
+    return season_index.default_index().season(year or datetime.today().year)
 
-def DriverAPI():
-    url = "http://ergast.com/api/f1/2022/2/drivers.json"
-
-    headers = {}
-
-    response = requests.request("GET", url, headers=headers)
-    data = response.json()
-    for i in data["MRData"]["DriverTable"]["Drivers"]:
-        drivers.append(i['code'])
-
-    with open(file="drivers.txt", mode='w') as f:
-        for line in drivers:
-            f.write(f"{line}\n")
-
-
-def RaceAPI():
-    schedule = fastf1.get_event_schedule(datetime.today().year)
-
-    df = pd.DataFrame(schedule)
-    for i in df["Country"]:
-        races.append(i + " " + "Grand Prix")
-
-    with open(file="races.txt", mode='w') as f:
-        for line in races:
-            f.write(line)
-            f.write('\n')
-
-
-get_drivers()
-get_races()
-print("Races and Drivers for Current Year Loaded")
 
 # Colors
 text_color = "#F5F3F4"
@@ -86,6 +70,9 @@ hover_color = "#E5383B"
 main_bg = "#0B090A"
 secondary_bg = "#161A1D"
 fastest_lap = "#ED00FF"
+# Fallback colors for drivers fastf1 has no color for
+comparison_colors = ["#E5383B", "#3A86FF", "#FFBE0B",
+                     "#8AC926", "#FF006E", "#00F5D4", "#FB5607", "#9B5DE5"]
 
 # Appearance settings
 customtkinter.set_appearance_mode("Dark")
@@ -103,168 +90,283 @@ class App(customtkinter.CTk):
         self.geometry(f'{1600}x{800}')
         self.resizable(0, 0)
 
+        # Background data loads
+        self.tasks = tasks.TaskRunner(self)
+        # Background loads of the rest of the selected weekend
+        self.prefetcher = None
+        # Profiling token of the action in progress
+        self.action = None
+        # Stops live mode, set while the prediction frame is open
+        self.stopLive = None
+
         # Functions
         def DeletePages():
+            self.tasks.cancel("telemetry", "predict", "degradation", "live")
+            if self.stopLive is not None:
+                self.stopLive()
+                self.stopLive = None
+            if self.prefetcher is not None:
+                self.prefetcher.cancel()
             for frame in self.mainframe.winfo_children():
                 frame.destroy()
 
         def Exit():
+            self.tasks.shutdown()
+            if self.prefetcher is not None:
+                self.prefetcher.shutdown()
             self.quit()
 
-        def UpdateYear(year):
+        def StartAction(name):
+            self.action = profiling.begin(name)
+
+        def FinishAction(status=None, text=""):
+            # With F1_PROFILE set the breakdown is logged and shown in the status
+            if self.action is not None:
+                breakdown = profiling.end(self.action)
+                self.action = None
+                if profiling.ENABLED:
+                    text = f"{text}  {profiling.format_breakdown(breakdown)}".strip()
+            if status is not None:
+                status.configure(text=text)
+
+        def SelectionChanged(value):
+            # Loads for the previous selection are no longer wanted
+            self.tasks.cancel("telemetry", "predict", "degradation", "live")
+            if self.stopLive is not None:
+                self.stopLive()
+                self.liveSwitch.deselect()
+            if self.prefetcher is not None:
+                self.prefetcher.cancel()
+
+        def Prefetch(current=None, sessions=None, data="laps"):
+            # Queue the rest of the weekend, the session on screen first
+            gp = self.gpSelector.get()
+            if gp not in races:
+                return
+            if self.prefetcher is None:
+                self.prefetcher = prefetch.PrefetchScheduler()
+            self.prefetcher.schedule(int(self.yearSelector.get()), gp,
+                                     sessions=sessions, current=current, data=data)
+
+        def PrefetchTelemetry(value):
+            SelectionChanged(value)
+            session = self.sessionSelector.get()
+            Prefetch(current=session if session != "Session..." else None, data="car_data")
+
+        def PrefetchPractice(value):
+            SelectionChanged(value)
+            Prefetch(sessions=["Practice 1", "Practice 2", "Practice 3"])
+
+        def PrefetchRace(value):
+            SelectionChanged(value)
+            Prefetch(sessions=["Race"])
+
+        def FetchSeason(year):
+            return get_season(int(year))
+
+        def ShowStartupSeason(season):
+            seasonRaces, seasonDrivers = season
+            races.extend(seasonRaces)
+            drivers.extend(seasonDrivers)
+            log.info("Races and drivers for the current year loaded")
+
+            # A frame opened before the season arrived gets the new values
+            for selector, values in (("gpSelector", races), ("driverSelector", drivers)):
+                if hasattr(self, selector) and getattr(self, selector).winfo_exists():
+                    getattr(self, selector).configure(values=values)
+
+        def ShowStartupError(error):
+            # Without a season there is nothing to select, offer another try
+            log.warning("Could not load the season: %s", error)
+            self.seasonStatus.configure(
+                text=f"Could not load the season: {error}")
+            self.seasonStatus.place(x=25, y=600)
+            self.seasonRetry.place(x=25, y=700)
+
+        def LoadStartupSeason():
+            self.seasonStatus.place_forget()
+            self.seasonRetry.place_forget()
+            self.tasks.submit("season", get_season, on_done=ShowStartupSeason,
+                              on_error=ShowStartupError)
+
+        def Startup():
+            # Season metadata first, then the heavy modules, both off the UI thread
+            LoadStartupSeason()
+            self.tasks.submit("modules", load_modules)
+
+        def ShowSeason(season):
+            seasonRaces, seasonDrivers = season
 
-            print(year)
             races.clear()
-
-            schedule = fastf1.get_event_schedule(int(year))
-            df = pd.DataFrame(schedule)
-
-            for i in df["Country"] + " " + "Grand Prix":
-                races.append(i)
-
+            races.extend(seasonRaces)
             self.gpSelector.configure(values=races)
 
             drivers.clear()
+            drivers.extend(seasonDrivers)
 
-            url = f"http://ergast.com/api/f1/{year}/2/drivers.json"
-
-            headers = {}
-
-            response = requests.request("GET", url, headers=headers)
-            data = response.json()
-            for i in data["MRData"]["DriverTable"]["Drivers"]:
-                drivers.append(i['code'])
-
-            print(drivers)
+            log.debug("Drivers: %s", drivers)
             self.driverSelector.configure(values=drivers)
 
             self.sessionSelector.set("Session...")
             self.gpSelector.set("GP...")
             self.driverSelector.set("Driver...")
 
-        def GetPracticeData(year, gp):
-            try:
-                practice1 = fastf1.get_session(year, gp, 'Practice 1')
-                prac1 = pd.DataFrame(practice1.load_laps(with_telemetry=True))
-            except:
-                prac1 = pd.DataFrame()
-
-            try:
-                practice2 = fastf1.get_session(year, gp, 'Practice 2')
-                prac2 = pd.DataFrame(practice2.load_laps(with_telemetry=True))
-            except:
-                prac2 = pd.DataFrame()
-
-            try:
-                practice3 = fastf1.get_session(year, gp, 'Practice 3')
-                prac3 = pd.DataFrame(practice3.load_laps(with_telemetry=True))
-            except:
-                prac3 = pd.DataFrame()
+        def UpdateYear(year):
+            SelectionChanged(year)
 
-            return prac1, prac2, prac3
+            self.gpSelector.set("Loading...")
+            self.tasks.submit("season", FetchSeason, year, on_done=ShowSeason,
+                              on_error=lambda error: self.gpSelector.set("GP..."))
 
         def LoadTelemetryFrame():
+            load_modules()
 
             # Telemetry Frame Functions
-            def RemovePlots():
-                FigureCanvas = Canvas()
-                for plot in self.telemetryFrame.winfo_children():
-                    if type(plot) == type(FigureCanvas):
-                        print("Removed canvas")
-                        plot.destroy()
+            def GetTelemetryData(year, gp, sessionName, driverCode, task):
+                # The key lets the plots cache their decimated lines
+                key = (year, gp, sessionName, driverCode, "fastest")
+                return key, analysis.driver_delta(year, gp, sessionName, driverCode, check=task.check)
+
+            def ShowTelemetryError(error):
+                FinishAction(self.telemetryStatus,
+                             f"Could not load telemetry: {error}")
 
             def LoadTelemetryPlot(driver):
-                RemovePlots()
                 # determine Driver's code
                 driverCode = driver[str(driver).find(" ") +
                                     1:str(driver).find(" ")+4].upper()
 
-                # Get the selected session
-                session = fastf1.get_session(
-                    int(self.yearSelector.get()), self.gpSelector.get(), self.sessionSelector.get())
-                session.load()
-
-                # fid the required information for plots
-                driverFastestLap = session.laps.pick_driver(
-                    driverCode).pick_fastest()
-                driverTelemetry = driverFastestLap.get_car_data().add_distance()
-                driverColor = fastf1.plotting.driver_color(driverCode)
-
-                fastestLap = session.laps.pick_fastest()
-                deltaTime, ref_tel, compare_tel = utils.delta_time(
-                    driverFastestLap, fastestLap)
-
-                # Create delta plot
-                deltaFigure = plt.figure(figsize=(12, 3), dpi=100)
-                deltaFigure.patch.set_facecolor(secondary_bg)
-
-                # delta axis
-                deltaAX = deltaFigure.add_subplot(1, 1, 1)
-                deltaAX.plot(ref_tel['Distance'], ref_tel['Speed'],
-                             color=driverColor)
-                deltaAX.plot(compare_tel['Distance'], compare_tel['Speed'],
-                             color=fastest_lap)
-                # secondary axis for delta plot
-                twin = deltaAX.twinx()
-                twin.plot(ref_tel['Distance'], deltaTime, '--', color='white')
-                twin.set_ylabel(
-                    f"<-- Fastest ahead | {driverCode} ahead -->")
-                twin.yaxis.label.set_color(text_color)
-
-                # create main speed plot
-                figure = plt.figure(figsize=(12, 4), dpi=100)
-                figure.patch.set_facecolor(secondary_bg)
-
-                # Add axis for main speed plot
-                ax = figure.add_subplot(1, 1, 1)
-                ax.plot(driverTelemetry['Distance'], driverTelemetry['Speed'],
-                        color=driverColor, label=driverCode)
-                ax.set_xlabel("Distance in m")
-                ax.set_ylabel("Speed in km/h")
-                ax.legend()
-
-                # color adjustment main plot
-                ax.set_facecolor(secondary_bg)
-                ax.spines['bottom'].set_color(text_color)
-                ax.spines['top'].set_color(text_color)
-                ax.spines['left'].set_color(text_color)
-                ax.spines['right'].set_color(text_color)
-
-                ax.tick_params(axis='x', colors=text_color)
-                ax.tick_params(axis='y', colors=text_color)
-
-                ax.yaxis.label.set_color(text_color)
-                ax.xaxis.label.set_color(text_color)
-                # color adjustment main plot ends
-
-                # color adjustment delta plot
-                deltaAX.set_facecolor(secondary_bg)
-                deltaAX.spines['bottom'].set_color(text_color)
-                deltaAX.spines['top'].set_color(text_color)
-                deltaAX.spines['left'].set_color(text_color)
-                deltaAX.spines['right'].set_color(text_color)
-
-                # twin.tick_params(axis='x', colors=text_color)
-                twin.tick_params(axis='y', colors=text_color)
-                deltaAX.tick_params(axis='x', colors=text_color)
-                deltaAX.tick_params(axis='y', colors=text_color)
-
-                deltaAX.yaxis.label.set_color(text_color)
-                deltaAX.xaxis.label.set_color(text_color)
-                # color adjustment delta plot
-
-                # Display main plot
-                figureCanvas = FigureCanvasTkAgg(figure, self.telemetryFrame)
-                figureCanvas.get_tk_widget().grid(
-                    row=2, rowspan=3, column=0, columnspan=5, padx=20, pady=10)
-
-                # Display delta plot
-                deltaFigureCanvas = FigureCanvasTkAgg(
-                    deltaFigure, self.telemetryFrame)
-                deltaFigureCanvas.get_tk_widget().grid(
-                    row=5, rowspan=3, column=0, columnspan=5, padx=20, pady=10)
+                mapMode = MapMode()
+                if mapMode is not None:
+                    LoadTrackMap([driverCode], mapMode)
+                    return
+
+                self.telemetryStatus.configure(text="Loading session...")
+                StartAction("telemetry")
+                self.tasks.submit("telemetry", GetTelemetryData,
+                                  int(self.yearSelector.get()), self.gpSelector.get(), self.sessionSelector.get(), driverCode,
+                                  on_done=ShowTelemetryPlot, on_error=ShowTelemetryError, with_task=True)
+
+            def DriverColor(driverCode, index=0):
+                try:
+                    return fastf1.plotting.driver_color(driverCode)
+                except Exception:
+                    return comparison_colors[index % len(comparison_colors)]
+
+            def GetComparisonData(year, gp, sessionName, driverCodes, task):
+                return analysis.compare_drivers(year, gp, sessionName, driverCodes, check=task.check)
+
+            def CompareDrivers():
+                driverCodes = [code.strip().upper() for code in self.compareEntry.get().replace(
+                    ";", ",").split(",") if code.strip()]
+                if not driverCodes:
+                    self.telemetryStatus.configure(
+                        text="Enter driver codes to compare, e.g. VER, LEC, HAM")
+                    return
+
+                # On the map a comparison shows who is fastest where
+                if MapMode() is not None:
+                    LoadTrackMap(driverCodes, "Fastest")
+                    return
+
+                self.telemetryStatus.configure(text="Loading session...")
+                StartAction("comparison")
+                self.tasks.submit("telemetry", GetComparisonData,
+                                  int(self.yearSelector.get()), self.gpSelector.get(), self.sessionSelector.get(), driverCodes,
+                                  on_done=ShowComparisonPlot, on_error=ShowTelemetryError, with_task=True)
+
+            def ShowComparisonPlot(comparison):
+                colors = [DriverColor(code, i)
+                          for i, code in enumerate(comparison.drivers)]
+
+                if self.comparisonPlot is None:
+                    self.comparisonPlot = plotting.ComparisonPlot(
+                        self.telemetryFrame, plotTheme, telemetry.CHANNELS)
+                    self.comparisonPlot.widget().grid(
+                        row=2, rowspan=6, column=0, columnspan=5, padx=20, pady=10)
+                ShowOnly(self.comparisonPlot)
+
+                with profiling.span("render.comparison"):
+                    self.comparisonPlot.update(comparison, colors)
+                FinishAction(self.telemetryStatus,
+                             f"Deltas against {comparison.reference}")
+
+            def ShowTelemetryPlot(telemetryData):
+                key, (driverCode, driverTelemetry, deltaTime,
+                      ref_tel, compare_tel) = telemetryData
+                driverColor = DriverColor(driverCode)
+
+                # Plots are created once and reused for every driver
+                if self.telemetryPlot is None:
+                    self.telemetryPlot = plotting.TelemetryPlot(
+                        self.telemetryFrame, plotTheme, fastest_lap)
+                    speedWidget, deltaWidget = self.telemetryPlot.widgets()
+                    # Display main plot
+                    speedWidget.grid(
+                        row=2, rowspan=3, column=0, columnspan=5, padx=20, pady=10)
+                    # Display delta plot
+                    deltaWidget.grid(
+                        row=5, rowspan=3, column=0, columnspan=5, padx=20, pady=10)
+
+                ShowOnly(self.telemetryPlot)
+
+                with profiling.span("render.telemetry"):
+                    self.telemetryPlot.update(
+                        driverCode, driverColor, driverTelemetry, deltaTime, ref_tel, compare_tel, key)
+                FinishAction(self.telemetryStatus)
+
+            def ShowOnly(plot):
+                # Only one of the views is on screen at a time
+                for view in (self.telemetryPlot, self.comparisonPlot, self.trackMapPlot):
+                    if view is None:
+                        continue
+                    widgets = view.widgets() if hasattr(view, "widgets") else [view.widget()]
+                    for widget in widgets:
+                        if view is plot:
+                            widget.grid()
+                        else:
+                            widget.grid_remove()
+
+            def MapMode():
+                view = self.viewSelector.get()
+                return view[len("Map: "):] if view.startswith("Map: ") else None
+
+            def GetTrackMap(year, gp, sessionName, driverCodes, mode, task):
+                return mode, analysis.circuit_map(year, gp, sessionName, driverCodes, mode, check=task.check)
+
+            def LoadTrackMap(driverCodes, mode):
+                self.telemetryStatus.configure(text="Loading session...")
+                StartAction("track_map")
+                self.tasks.submit("telemetry", GetTrackMap,
+                                  int(self.yearSelector.get()), self.gpSelector.get(), self.sessionSelector.get(), driverCodes, mode,
+                                  on_done=ShowTrackMap, on_error=ShowTelemetryError, with_task=True)
+
+            def ShowTrackMap(trackMap):
+                mode, (geometry, values, driverCodes) = trackMap
+                colors = [DriverColor(code, i)
+                          for i, code in enumerate(driverCodes)]
+
+                if self.trackMapPlot is None:
+                    self.trackMapPlot = track_map.TrackMapPlot(
+                        self.telemetryFrame, plotTheme)
+                    self.trackMapPlot.widget().grid(
+                        row=2, rowspan=6, column=0, columnspan=5, padx=20, pady=10)
+                ShowOnly(self.trackMapPlot)
+
+                with profiling.span("render.track_map"):
+                    self.trackMapPlot.update(
+                        geometry, values, mode, driverCodes, colors)
+                FinishAction(self.telemetryStatus)
+
+            def ViewChanged(view):
+                driver = self.driverSelector.get()
+                if driver in drivers:
+                    LoadTelemetryPlot(driver)
 
             DeletePages()
+            self.telemetryPlot = None
+            self.comparisonPlot = None
+            self.trackMapPlot = None
             self.telemetryFrame = customtkinter.CTkFrame(
                 self.mainframe)
 
@@ -283,13 +385,13 @@ class App(customtkinter.CTk):
             # GP Selector
             self.gpSelector = customtkinter.CTkComboBox(self.telemetryFrame,
                                                         border_color=button_color, text_color=text_color, dropdown_hover_color=hover_color, corner_radius=5, dropdown_text_color=text_color, width=200,
-                                                        values=races)
+                                                        values=races, command=PrefetchTelemetry)
             self.gpSelector.set("GP...")
             self.gpSelector.grid(row=0, column=1, padx=10, pady=10)
             # Session Selector
             self.sessionSelector = customtkinter.CTkComboBox(self.telemetryFrame,
                                                              border_color=button_color, text_color=text_color, dropdown_hover_color=hover_color, corner_radius=5, dropdown_text_color=text_color, width=200,
-                                                             values=["Race", "Qualifying", "Practice 3", "Practice 2", "Practice 1"])
+                                                             values=["Race", "Qualifying", "Practice 3", "Practice 2", "Practice 1"], command=PrefetchTelemetry)
             self.sessionSelector.set("Session...")
             self.sessionSelector.grid(row=0, column=2, padx=10, pady=10)
             # Driver Selector
@@ -298,116 +400,162 @@ class App(customtkinter.CTk):
                                                             values=drivers, command=LoadTelemetryPlot)
             self.driverSelector.set("Driver...")
             self.driverSelector.grid(row=0, column=3, padx=10, pady=10)
+            # Loading status
+            self.telemetryStatus = customtkinter.CTkLabel(
+                self.telemetryFrame, text="", font=customtkinter.CTkFont(size=12, weight="bold"), text_color=hover_color)
+            self.telemetryStatus.grid(row=1, column=0, columnspan=2)
+            # Comparison mode
+            self.compareEntry = customtkinter.CTkEntry(self.telemetryFrame, border_color=button_color, text_color=text_color, width=200,
+                                                       placeholder_text="Compare e.g. VER, LEC, HAM")
+            self.compareEntry.grid(row=1, column=2, padx=10, pady=10)
+            self.compareButton = customtkinter.CTkButton(self.telemetryFrame,
+                                                         text="Compare", command=CompareDrivers, text_color=text_color, fg_color=button_color, hover_color=hover_color,)
+            self.compareButton.grid(row=1, column=3, padx=10, pady=10)
+            # Speed trace or track map
+            self.viewSelector = customtkinter.CTkComboBox(self.telemetryFrame,
+                                                          border_color=button_color, text_color=text_color, dropdown_hover_color=hover_color, corner_radius=5, dropdown_text_color=text_color, width=200,
+                                                          values=["Speed trace", "Map: Speed", "Map: Gear", "Map: Fastest"], command=ViewChanged)
+            self.viewSelector.set("Speed trace")
+            self.viewSelector.grid(row=1, column=4, padx=10, pady=10)
             # Pack Telemetry Frame
             self.telemetryFrame.pack(
                 side="top", fill="both", expand=True)
 
         def LoadQualiPrediction():
+            load_modules()
             DeletePages()
             # function variables
-            qualiPredictionsDictionary = {}
+            predictionColumns = ["Pos", "Driver", "Sector 1",
+                                 "Sector 2", "Sector 3", "Ideal Lap"]
+            liveState = {}
+            self.frame = None
 
             # frame functions
+            def DriverColor(driver):
+                try:
+                    return fastf1.plotting.driver_color(driver)
+                except Exception:
+                    return text_color
+
+            def RunPrediction(year, gp, roster, task):
+                def Progress(done, total, result):
+                    task.progress(done, total, f"{result.name} loaded")
+
+                return analysis.predict_quali(year, gp, roster, progress=Progress, check=task.check, store=analysis.default_store())
+
+            def ShowProgress(done, total, message):
+                self.msgToUser.configure(
+                    text=f"Running Algorithm...{message} ({done}/{total})")
+
+            def ShowPredictionError(error):
+                FinishAction(self.msgToUser, f"Prediction failed: {error}")
+
             def Predict():
-                qualiPredictionsDictionary.clear()
+                if hasattr(self, "msgToUser") and self.msgToUser.winfo_exists():
+                    self.msgToUser.destroy()
 
                 self.msgToUser = customtkinter.CTkLabel(
                     self.qualityPredictionFrame, text="Running Algorithm...This might take a while...", font=customtkinter.CTkFont(size=12, weight="bold"), text_color=hover_color)
                 self.msgToUser.grid(row=0, column=3)
-                self.qualityPredictionFrame.update()
-
-                prac1, prac2, prac3 = GetPracticeData(
-                    int(self.yearSelector.get()), self.gpSelector.get())
-
-                for driver in drivers:
-                    s1Times = []
-                    s2Times = []
-                    s3Times = []
-
-                    for i in prac1.index:
-                        if prac1['Driver'][i] == driver:
-                            if prac1['IsAccurate'][i] == True:
-                                s1Times.append(prac1['Sector1Time'][i])
-                                s2Times.append(prac1['Sector2Time'][i])
-                                s3Times.append(prac1['Sector3Time'][i])
-                    for i in prac2.index:
-                        if prac2['Driver'][i] == driver:
-                            if prac2['IsAccurate'][i] == True:
-                                s1Times.append(prac2['Sector1Time'][i])
-                                s2Times.append(prac2['Sector2Time'][i])
-                                s3Times.append(prac2['Sector3Time'][i])
-                    for i in prac3.index:
-                        if prac3['Driver'][i] == driver:
-                            if prac3['IsAccurate'][i] == True:
-                                s1Times.append(prac3['Sector1Time'][i])
-                                s2Times.append(prac3['Sector2Time'][i])
-                                s3Times.append(prac3['Sector3Time'][i])
-
-                    s1Times.sort()
-                    s2Times.sort()
-                    s3Times.sort()
-
-                    if len(s1Times) > 0 and len(s2Times) > 0 and len(s3Times) > 0:
-                        laptime = s1Times[0] + s2Times[0] + s3Times[0]
-                        qualiPredictionsDictionary[driver] = laptime
-                    else:
-                        pass
 
-                self.msgToUser.destroy()
-                self.qualityPredictionFrame.update()
-
-                sortedDict = sorted(
-                    qualiPredictionsDictionary.items(), key=lambda x: x[1])
-
-                colCount = 0
-                rowCount = 1
-                count = 1
-
-                self.frame = customtkinter.CTkFrame(
-                    self.qualityPredictionFrame, corner_radius=5)
-                self.frame.grid(
-                    row=1, rowspan=10, column=0, columnspan=2, padx=25, pady=2)
-
-                for key, value in sortedDict:
-                    color = text_color
-                    x = str(value).split(":")
-                    final = f"{x[1][-1:]}:{x[2][:-3]}"
-
-                    print(f"#{count}\t{key}\t{final}")
-                    if colCount < 2:
-                        try:
-                            color = fastf1.plotting.driver_color(key)
-                        except:
-                            pass
-
-                        self.gridSlot = customtkinter.CTkFrame(
-                            self.frame, border_color=text_color, border_width=1, corner_radius=2)
-                        self.gridSlot.grid(
-                            row=count, column=colCount, padx=50, pady=1)
-
-                        self.Driver = customtkinter.CTkLabel(
-                            self.gridSlot, text=f"#{count}\t{key}\t{final}", font=customtkinter.CTkFont(size=12, weight="bold"), text_color=color)
-                        self.Driver.pack(padx=(2, 0), pady=(0, 2))
-                    else:
-                        colCount = 0
-                        rowCount += 1
-                        try:
-                            color = fastf1.plotting.driver_color(key)
-                        except:
-                            pass
-
-                        self.gridSlot = customtkinter.CTkFrame(
-                            self.frame, border_color=text_color, border_width=1, corner_radius=2)
-                        self.gridSlot.grid(
-                            row=count, column=colCount, padx=50, pady=1)
-
-                        self.Driver = customtkinter.CTkLabel(
-                            self.gridSlot, text=f"#{count}\t{key}\t{final}", font=customtkinter.CTkFont(size=12, weight="bold"), text_color=color)
-                        self.Driver.pack(padx=(2, 0), pady=(0, 2))
-
-                    colCount += 1
-                    count += 1
+                StartAction("predict")
+                self.tasks.submit("predict", RunPrediction,
+                                  int(self.yearSelector.get()), self.gpSelector.get(), list(drivers),
+                                  on_done=ShowPrediction, on_progress=ShowProgress, on_error=ShowPredictionError, with_task=True)
 
+            def ShowPrediction(prediction):
+                self.msgToUser.destroy()
+                with profiling.span("render.standings"):
+                    ShowStandings(prediction)
+                FinishAction()
+
+            def ShowStandings(prediction):
+                if self.frame is None:
+                    self.frame = results_table.ResultsTable(self.qualityPredictionFrame, predictionColumns, visible_rows=22,
+                                                            widths={"Pos": 50, "Driver": 80}, text_color=text_color, header_color=button_color, hover_color=hover_color, corner_radius=5)
+                    self.frame.grid(
+                        row=1, rowspan=10, column=0, columnspan=4, padx=25, pady=2, sticky="nw")
+
+                table = pd.DataFrame({
+                    "Pos": range(1, len(prediction.index) + 1),
+                    "Driver": prediction.index,
+                    "Sector 1": prediction["Sector1Time"].to_numpy() if "Sector1Time" in prediction.columns else pd.NaT,
+                    "Sector 2": prediction["Sector2Time"].to_numpy() if "Sector2Time" in prediction.columns else pd.NaT,
+                    "Sector 3": prediction["Sector3Time"].to_numpy() if "Sector3Time" in prediction.columns else pd.NaT,
+                    "Ideal Lap": prediction["IdealLap"].to_numpy(),
+                })
+                colors = [DriverColor(driver) for driver in prediction.index]
+                self.frame.set_data(table, colors)
+
+            # Live mode
+            def LoadReplay(year, gp, task):
+                practices = analysis.practice_data(
+                    year, gp, store=analysis.default_store())
+                # Stores ingested before session time was kept cannot be replayed
+                if not any(prac is not None and "Time" in prac.columns for prac in practices):
+                    practices = analysis.practice_data(year, gp)
+                task.check()
+                return live.ReplaySource.from_sessions(practices, speed=60)
+
+            def StartLive():
+                year, gp = int(self.yearSelector.get()), self.gpSelector.get()
+                liveState["predictor"] = live.LivePredictor(list(drivers))
+                self.liveStatus.configure(text="Live: starting...")
+
+                if self.liveSource.get() == "Live timing":
+                    liveState["interval"] = 30000
+                    ReplayReady(live.PollingSource(
+                        live.practice_fetcher(year, gp)))
+                else:
+                    liveState["interval"] = 1000
+                    self.tasks.submit("live", LoadReplay, year, gp,
+                                      on_done=ReplayReady, on_error=LiveError, with_task=True, background=True)
+
+            def ReplayReady(source):
+                liveState["source"] = source
+                PollLive()
+
+            def StopLive():
+                self.tasks.cancel("live")
+                if "after" in liveState:
+                    self.after_cancel(liveState["after"])
+                liveState.clear()
+                self.liveStatus.configure(text="")
+
+            def ToggleLive():
+                if self.liveSwitch.get():
+                    StartLive()
+                else:
+                    StopLive()
+
+            def PollLive():
+                if "source" not in liveState or not self.liveSwitch.get():
+                    return
+                self.tasks.submit("live", liveState["source"].poll,
+                                  on_done=FeedLive, on_error=LiveError, background=True)
+
+            def FeedLive(batch):
+                livePredictor = liveState.get("predictor")
+                if livePredictor is None:
+                    return
+
+                # Only drivers who improved change the standings
+                if livePredictor.feed(batch):
+                    ShowStandings(livePredictor.frame())
+
+                source = liveState["source"]
+                self.liveStatus.configure(
+                    text=f"Live: {livePredictor.laps_seen} laps" + (" (replay finished)" if source.finished else ""))
+                if not source.finished:
+                    liveState["after"] = self.after(
+                        liveState["interval"], PollLive)
+
+            def LiveError(error):
+                StopLive()
+                self.liveStatus.configure(text=f"Live failed: {error}")
+                self.liveSwitch.deselect()
+
+            self.stopLive = StopLive
             self.qualityPredictionFrame = customtkinter.CTkFrame(
                 self.mainframe)
             # Year Selector
@@ -426,7 +574,7 @@ class App(customtkinter.CTk):
             # GP Selector
             self.gpSelector = customtkinter.CTkComboBox(self.qualityPredictionFrame,
                                                         border_color=button_color, text_color=text_color, dropdown_hover_color=hover_color, corner_radius=5, dropdown_text_color=text_color, width=200,
-                                                        values=races)
+                                                        values=races, command=PrefetchPractice)
             self.gpSelector.set("GP...")
             self.gpSelector.grid(row=0, column=1, padx=10, pady=10)
 
@@ -435,13 +583,73 @@ class App(customtkinter.CTk):
                                                             text="Predict", command=Predict, text_color=text_color, fg_color=button_color, hover_color=hover_color,)
             self.predictionButton.grid(row=0, column=2, padx=10, pady=10)
 
+            # Live mode controls
+            self.liveSource = customtkinter.CTkComboBox(self.qualityPredictionFrame,
+                                                        border_color=button_color, text_color=text_color, dropdown_hover_color=hover_color, corner_radius=5, dropdown_text_color=text_color, width=150,
+                                                        values=["Replay x60", "Live timing"])
+            self.liveSource.set("Replay x60")
+            self.liveSource.grid(row=0, column=4, padx=10, pady=10)
+            self.liveSwitch = customtkinter.CTkSwitch(self.qualityPredictionFrame, text="Live", text_color=text_color,
+                                                      progress_color=hover_color, command=ToggleLive)
+            self.liveSwitch.grid(row=0, column=5, padx=10, pady=10)
+            self.liveStatus = customtkinter.CTkLabel(
+                self.qualityPredictionFrame, text="", font=customtkinter.CTkFont(size=12, weight="bold"), text_color=hover_color)
+            self.liveStatus.grid(row=1, column=4, columnspan=2)
+
             # Pack predictor frame
             self.qualityPredictionFrame.pack(
                 side="top", fill="both", expand=True)
 
         def LoadTyreDegradationFrame():
+            load_modules()
             DeletePages()
+            # function variables
+            degradationResults = {}
+
             # frame functions
+            def RunDegradation(year, gp, task):
+                return analysis.tyre_degradation(year, gp, check=task.check, store=analysis.default_store())
+
+            def ShowDegradationError(error):
+                FinishAction(self.degradationStatus,
+                             f"Could not analyse race: {error}")
+
+            def Analyse():
+                self.degradationStatus.configure(text="Loading race...")
+                StartAction("degradation")
+                self.tasks.submit("degradation", RunDegradation,
+                                  int(self.yearSelector.get()), self.gpSelector.get(),
+                                  on_done=ShowDegradation, on_error=ShowDegradationError, with_task=True)
+
+            def ShowDegradation(result):
+                degradationResults["laps"], degradationResults["fits"] = result
+                PlotDegradation(self.driverSelector.get())
+                FinishAction(self.degradationStatus)
+
+            def PlotDegradation(driver):
+                if not degradationResults:
+                    return
+
+                laps = degradationResults["laps"]
+                fits = degradationResults["fits"]
+                if driver not in set(fits["Driver"]):
+                    driver = None
+
+                # degradation plot
+                ax = self.degradationAX
+                plotting.clear_axes(ax, plotTheme)
+                with matplotlib.rc_context(plotTheme):
+                    degradation.plot(ax, laps, fits, driver)
+                    handles, labels = ax.get_legend_handles_labels()
+                    if handles:
+                        ax.legend()
+                with profiling.span("render.draw"):
+                    self.degradationCanvas.draw()
+
+                # stint table
+                table = fits if driver is None else fits[fits["Driver"] == driver]
+                self.degradationTable.set_data(table, [degradation.COMPOUND_COLORS.get(
+                    compound, text_color) for compound in table["Compound"]])
 
             self.tyreDegradationFrame = customtkinter.CTkFrame(
                 self.mainframe)
@@ -460,15 +668,40 @@ class App(customtkinter.CTk):
             # Drivers
             self.driverSelector = customtkinter.CTkComboBox(self.tyreDegradationFrame,
                                                             border_color=button_color, text_color=text_color, dropdown_hover_color=hover_color, corner_radius=5, dropdown_text_color=text_color, width=200,
-                                                            values=drivers)
+                                                            values=drivers, command=PlotDegradation)
             self.driverSelector.set("Driver...")
             self.driverSelector.grid(row=0, column=3, padx=10, pady=10)
             # GP Selector
             self.gpSelector = customtkinter.CTkComboBox(self.tyreDegradationFrame,
                                                         border_color=button_color, text_color=text_color, dropdown_hover_color=hover_color, corner_radius=5, dropdown_text_color=text_color, width=200,
-                                                        values=races)
+                                                        values=races, command=PrefetchRace)
             self.gpSelector.set("GP...")
             self.gpSelector.grid(row=0, column=1, padx=10, pady=10)
+            # Analyse button
+            self.analyseButton = customtkinter.CTkButton(self.tyreDegradationFrame,
+                                                         text="Analyse", command=Analyse, text_color=text_color, fg_color=button_color, hover_color=hover_color,)
+            self.analyseButton.grid(row=0, column=2, padx=10, pady=10)
+            # Loading status
+            self.degradationStatus = customtkinter.CTkLabel(
+                self.tyreDegradationFrame, text="", font=customtkinter.CTkFont(size=12, weight="bold"), text_color=hover_color)
+            self.degradationStatus.grid(row=1, column=0, columnspan=4)
+
+            # Degradation plot
+            self.degradationFigure, self.degradationAX = plotting.themed_figure(
+                plotTheme, (12, 4))
+            self.degradationCanvas = plotting.FigureCanvasTkAgg(
+                self.degradationFigure, self.tyreDegradationFrame)
+            self.degradationCanvas.get_tk_widget().grid(
+                row=2, rowspan=3, column=0, columnspan=5, padx=20, pady=10)
+
+            # Stint table
+            self.degradationTable = results_table.ResultsTable(self.tyreDegradationFrame, degradation.FIT_COLUMNS, visible_rows=8, widths={"Stint": 60, "Laps": 60}, formatters={
+                "Stint": lambda values: values.map("{:.0f}".format).to_numpy(dtype=object),
+                "Slope": lambda values: values.map("{:+.3f} s/lap".format).to_numpy(dtype=object),
+                "R2": lambda values: values.map("{:.2f}".format).to_numpy(dtype=object)},
+                text_color=text_color, header_color=button_color, hover_color=hover_color)
+            self.degradationTable.grid(
+                row=5, rowspan=3, column=0, columnspan=5, padx=20, pady=10)
 
             # Pack frame
             self.tyreDegradationFrame.pack(
@@ -498,6 +731,12 @@ class App(customtkinter.CTk):
             self.sidebar, text="Qualifying Predictor", width=200, text_color=text_color, fg_color=button_color, hover_color=hover_color, command=LoadQualiPrediction)
         self.quali.place(x=25, y=150)
 
+        # Shown when the season could not be loaded at startup
+        self.seasonStatus = customtkinter.CTkLabel(
+            self.sidebar, text="", width=200, wraplength=200, justify="left", text_color=text_color)
+        self.seasonRetry = customtkinter.CTkButton(
+            self.sidebar, text="Retry", width=200, text_color=text_color, fg_color=button_color, hover_color=hover_color, command=LoadStartupSeason)
+
         self.exit = customtkinter.CTkButton(
             self.sidebar, text="Exit Program", width=200, text_color=text_color, fg_color=button_color, hover_color=hover_color, command=Exit)
         self.exit.place(x=25, y=750)
@@ -511,7 +750,12 @@ class App(customtkinter.CTk):
         self.mainframe.configure(width=1600, height=800)
         # Main Frame Section Ends
 
+        # Deferred startup work runs once the window is on screen
+        self.after_idle(Startup)
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s %(name)s %(message)s")
     app = App()
     app.mainloop()
@@ -0,0 +1,209 @@
+import logging
+import threading
+from collections import OrderedDict
+from fastf1 import utils
+import compact
+import degradation
+import predictor
+import profiling
+import season_index
+import session_cache
+import session_loader
+import telemetry
+import track_map
+
+# Analyses
+# Plain functions behind both the GUI and the headless command line, none
+# of them touch Tk.
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = session_cache.CACHE_DIR
+INGEST_SESSIONS = ["Practice 1", "Practice 2",
+                   "Practice 3", "Qualifying", "Race"]
+
+# Fastest lap telemetry per session in the compact layout, it outlives the
+# Session objects the session cache evicts
+TELEMETRY_SESSIONS = 16
+_telemetry = OrderedDict()
+_telemetry_lock = threading.Lock()
+
+
+def enable_cache(path=CACHE_DIR):
+    session_cache.enable_cache(path)
+
+
+def season(year):
+    return season_index.default_index().season(int(year))
+
+
+def default_store():
+    # The lap store is optional, it needs pyarrow and an ingested dataset
+    try:
+        import lap_store
+        store = lap_store.default_store()
+    except ImportError:
+        return None
+    return store if store.exists() else None
+
+
+def stored_laps(store, year, gp, sessions):
+    # Laps from the lap store, None when the event was never ingested
+    if store is None or not store.exists():
+        return None
+
+    laps = store.query(year=int(year), gp=gp, session=list(sessions))
+    if len(laps.index) == 0:
+        return None
+    return [laps[laps["Session"] == name].reset_index(drop=True) for name in sessions]
+
+
+def practice_data(year, gp, progress=None, store=None):
+    practices = stored_laps(
+        store, year, gp, session_loader.PRACTICE_SESSIONS)
+    if practices is not None:
+        return tuple(practices)
+
+    results = session_loader.load_sessions(
+        year, gp, session_loader.PRACTICE_SESSIONS, data="laps", progress=progress)
+
+    for result in results:
+        if result.ok:
+            log.info("%s loaded in %.2fs", result.name, result.elapsed)
+        else:
+            log.warning("%s failed to load: %s", result.name, result.error)
+
+    prac1, prac2, prac3 = (result.laps for result in results)
+    return prac1, prac2, prac3
+
+
+def predict_quali(year, gp, drivers=None, method="best", progress=None, check=None, store=None):
+    practices = practice_data(year, gp, progress, store)
+    if check is not None:
+        check()
+
+    with profiling.span("predict"):
+        return predictor.predict(practices, drivers, method)
+
+
+def driver_delta(year, gp, sessionName, driverCode, check=None):
+    # Get the selected session
+    session = session_cache.get_session(year, gp, sessionName, data="car_data")
+    if check is not None:
+        check()
+
+    # find the required information for plots
+    with profiling.span("telemetry.car_data"):
+        driverFastestLap = session.laps.pick_driver(driverCode).pick_fastest()
+        driverTelemetry = driverFastestLap.get_car_data().add_distance()
+
+    with profiling.span("delta_time"):
+        fastestLap = session.laps.pick_fastest()
+        deltaTime, ref_tel, compare_tel = utils.delta_time(
+            driverFastestLap, fastestLap)
+
+    return driverCode, driverTelemetry, deltaTime, ref_tel, compare_tel
+
+
+def fastest_telemetry(year, gp, sessionName, driverCodes, check=None):
+    key = session_cache.SessionCache.key(year, gp, sessionName)
+    with _telemetry_lock:
+        store = _telemetry.get(key)
+        if store is not None:
+            _telemetry.move_to_end(key)
+            profiling.count("telemetry_store.hits")
+
+    missing = [d for d in driverCodes if store is None or (d, "fastest") not in store]
+    if missing:
+        session = session_cache.get_session(year, gp, sessionName, data="car_data")
+        if check is not None:
+            check()
+        with profiling.span("telemetry.car_data"):
+            fresh = compact.TelemetryStore.from_session(session, missing)
+        store = fresh if store is None else store.extend(fresh)
+
+        with _telemetry_lock:
+            _telemetry[key] = store
+            _telemetry.move_to_end(key)
+            while len(_telemetry) > TELEMETRY_SESSIONS:
+                _telemetry.popitem(last=False)
+    return store
+
+
+def compare_drivers(year, gp, sessionName, driverCodes=None, reference=None, check=None):
+    if not driverCodes:
+        session = session_cache.get_session(year, gp, sessionName, data="car_data")
+        driverCodes = list(session.laps["Driver"].dropna().unique())
+    driverCodes = list(driverCodes)
+    if reference is not None and reference not in driverCodes:
+        driverCodes.append(reference)
+
+    store = fastest_telemetry(year, gp, sessionName, driverCodes, check)
+    if check is not None:
+        check()
+
+    with profiling.span("telemetry.compare"):
+        return telemetry.compare(store.laps(driverCodes), reference)
+
+
+def circuit_geometry(year, gp, sessionName, check=None):
+    # Cached per circuit and season, layouts change between seasons
+    try:
+        event = season_index.default_index().event(int(year), name=gp)
+    except Exception:
+        event = None
+    location = event["location"] if event and event.get("location") else gp
+
+    def build():
+        session = session_cache.get_session(year, gp, sessionName, data="car_data")
+        if check is not None:
+            check()
+        return track_map.CircuitGeometry.from_session(session)
+
+    with profiling.span("track_map.geometry"):
+        return track_map.cache.get((int(year), location), build)
+
+
+def circuit_map(year, gp, sessionName, driverCodes, mode="Speed", check=None):
+    if mode not in track_map.MODES:
+        raise ValueError(
+            f"Unknown map mode '{mode}', expected one of {list(track_map.MODES)}")
+
+    geometry = circuit_geometry(year, gp, sessionName, check)
+    driverCodes = list(driverCodes)
+
+    if mode == "Fastest":
+        # A single driver is measured against the fastest lap of the session
+        if len(driverCodes) < 2:
+            session = session_cache.get_session(year, gp, sessionName, data="car_data")
+            fastest = session.laps.pick_fastest()["Driver"]
+            if fastest not in driverCodes:
+                driverCodes.append(fastest)
+        comparison = compare_drivers(year, gp, sessionName, driverCodes, check=check)
+        return geometry, geometry.sector_values(comparison.dominance(geometry.sectors)), comparison.drivers
+
+    driver = driverCodes[0]
+    store = fastest_telemetry(year, gp, sessionName, [driver], check)
+    if (driver, "fastest") not in store:
+        raise ValueError(f"No lap with telemetry for {driver}")
+    lap = store.lap(driver)
+    values = geometry.values(lap["Distance"], lap[track_map.MODES[mode]], discrete=mode == "Gear")
+    return geometry, values, [driver]
+
+
+def tyre_degradation(year, gp, check=None, store=None):
+    stored = stored_laps(store, year, gp, ["Race"])
+    if stored is not None:
+        with profiling.span("degradation.fit"):
+            return degradation.analyse(stored[0])
+
+    session = session_cache.get_session(year, gp, "Race", data="laps")
+    if check is not None:
+        check()
+
+    with profiling.span("degradation.fit"):
+        return degradation.analyse(session.laps)
+
+
+def ingest(year, gp, store, sessions=INGEST_SESSIONS):
+    return store.ingest(year, gp, sessions)
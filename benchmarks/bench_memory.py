@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import compact  # noqa: E402
+import fixtures  # noqa: E402
+import synthetic  # noqa: E402
+
+# Memory benchmark
+# Bytes held by the pandas frames the app used to keep against the compact
+# layout of the same laps and telemetry.
+
+SCALES = (1, 10, 100)
+PRACTICE_LAPS = 600
+
+
+def frame_bytes(frames):
+    return int(sum(frame.memory_usage(index=True, deep=True).sum() for frame in frames))
+
+
+def practice(scale):
+    practices = synthetic.practice_weekend(PRACTICE_LAPS * scale)
+    return frame_bytes(practices), compact.LapTable.from_sessions(practices).nbytes
+
+
+def race(scale):
+    laps = synthetic.race_laps(scale)
+    return frame_bytes([laps]), compact.LapTable.from_laps(laps).nbytes
+
+
+def car_data(scale):
+    # scale laps of car data for every driver, one DataFrame per lap as
+    # fastf1 hands them out
+    laps = {(driver, lap): synthetic.lap_telemetry(1, seed=i * 1000 + lap)
+            for i, driver in enumerate(synthetic.DRIVER_CODES) for lap in range(scale)}
+    frames = [synthetic.car_data(values) for values in laps.values()]
+    return frame_bytes(frames), compact.TelemetryStore.from_laps(laps).nbytes
+
+
+def recorded():
+    year, gp, _ = fixtures.RECORDED[0]
+    results = {}
+
+    practices = [pd.DataFrame(fixtures.load(year, gp, name).laps)
+                 for name in ("Practice 1", "Practice 2", "Practice 3")]
+    results["recorded.practice_laps"] = (
+        frame_bytes(practices), compact.LapTable.from_sessions(practices).nbytes)
+
+    # The whole session of car data, every channel the app reads
+    session = fixtures.load(year, gp, "Qualifying", "car_data")
+    channels = ["Time"] + compact.TELEMETRY_CHANNELS[2:]
+    laps = {(number, "session"): dict(
+        {c: car[c].to_numpy(dtype=float) for c in channels[1:]},
+        Time=car["SessionTime"].dt.total_seconds().to_numpy())
+        for number, car in session.car_data.items()}
+    store = compact.TelemetryStore.from_laps(laps, channels)
+    results["recorded.car_data"] = (frame_bytes(session.car_data.values()), store.nbytes)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare DataFrame and compact memory use")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--output", "-o", default=None)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, measure in (("practice_laps", practice), ("race_laps", race), ("car_data", car_data)):
+        for scale in args.scales:
+            results[f"{name}@{scale}x"] = measure(scale)
+    if fixtures.available():
+        results.update(recorded())
+
+    report = {}
+    for label, (frames, packed) in results.items():
+        report[label] = {"dataframe_bytes": frames, "compact_bytes": int(packed),
+                         "ratio": round(frames / packed, 2) if packed else None}
+        print(f"{label:<24} {frames / 1024 ** 2:10.2f} MB -> {packed / 1024 ** 2:8.2f} MB "
+              f"({frames / max(packed, 1):.1f}x smaller)")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"version": 1, "numpy": np.__version__, "pandas": pd.__version__,
+                       "results": report}, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
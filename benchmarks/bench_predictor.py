@@ -0,0 +1,59 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import predictor  # noqa: E402
+from synthetic import DRIVER_CODES, practice_weekend  # noqa: E402
+
+
+# The per driver row loop Predict() used before the predictor engine
+def legacy_predict(practices, drivers):
+    predictions = {}
+
+    for driver in drivers:
+        s1Times = []
+        s2Times = []
+        s3Times = []
+
+        for prac in practices:
+            for i in prac.index:
+                if prac['Driver'][i] == driver:
+                    if prac['IsAccurate'][i] == True:  # noqa: E712
+                        s1Times.append(prac['Sector1Time'][i])
+                        s2Times.append(prac['Sector2Time'][i])
+                        s3Times.append(prac['Sector3Time'][i])
+
+        s1Times = sorted(t for t in s1Times if t == t)
+        s2Times = sorted(t for t in s2Times if t == t)
+        s3Times = sorted(t for t in s3Times if t == t)
+
+        if len(s1Times) > 0 and len(s2Times) > 0 and len(s3Times) > 0:
+            predictions[driver] = s1Times[0] + s2Times[0] + s3Times[0]
+
+    return sorted(predictions.items(), key=lambda x: x[1])
+
+
+def main(n_laps=2000, repeat=3):
+    practices = practice_weekend(n_laps)
+
+    legacy = legacy_predict(practices, DRIVER_CODES)
+    vectorized = predictor.predict(practices, DRIVER_CODES)
+    assert [d for d, _ in legacy] == list(vectorized.index)
+    assert [t for _, t in legacy] == list(vectorized["IdealLap"])
+
+    legacy_time = min(timeit.repeat(
+        lambda: legacy_predict(practices, DRIVER_CODES), number=1, repeat=repeat))
+    print(f"legacy loop      3x{n_laps} laps: {legacy_time * 1000:9.1f} ms")
+
+    for method in predictor.AGGREGATIONS:
+        elapsed = min(timeit.repeat(
+            lambda: predictor.predict(practices, DRIVER_CODES, method),
+            number=1, repeat=repeat))
+        print(f"{method:<16} 3x{n_laps} laps: {elapsed * 1000:9.1f} ms "
+              f"({legacy_time / elapsed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
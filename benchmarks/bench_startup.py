@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Startup benchmark
+# Measures the import cost of the GUI module and the time until the first
+# frame is painted, and fails when either regresses or a heavy module is
+# imported before a frame needs it.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "F1-Analysis.py")
+HEAVY_MODULES = ["fastf1", "matplotlib", "pandas", "numpy", "requests"]
+
+IMPORT_SNIPPET = f"""
+import runpy
+runpy.run_path({APP!r}, run_name="f1_analysis")
+"""
+
+FIRST_FRAME_SNIPPET = f"""
+import json, runpy, sys, time
+start = time.perf_counter()
+namespace = runpy.run_path({APP!r}, run_name="f1_analysis")
+imported = time.perf_counter()
+app = namespace["App"]()
+# The deferred startup work starts importing in the background on update()
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+app.update()
+painted = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "first_frame_ms": (painted - start) * 1000,
+    "heavy_loaded": heavy,
+}}))
+app.tasks.shutdown()
+app.destroy()
+"""
+
+
+def import_times():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET],
+                            cwd=ROOT, capture_output=True, text=True)
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # import time:   self [us] |   cumulative | imported package
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+
+    # Top level imports are the ones without indentation
+    top = [(name.strip(), cumulative) for name, _, cumulative in modules
+           if not name.startswith("  ")]
+    return {
+        "total_ms": sum(cumulative for _, cumulative in top) / 1000,
+        "slowest": sorted(top, key=lambda m: m[1], reverse=True)[:10],
+        "heavy_loaded": [m for m in HEAVY_MODULES if any(
+            name.strip() == m for name, _, _ in modules)],
+    }
+
+
+def first_frame():
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return None
+
+    result = subprocess.run([sys.executable, "-c", FIRST_FRAME_SNIPPET],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-import-ms", type=float, default=1000)
+    parser.add_argument("--max-first-frame-ms", type=float, default=1000)
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    imports = import_times()
+    print(f"import time: {imports['total_ms']:.0f} ms")
+    for name, cumulative in imports["slowest"]:
+        print(f"  {name:<30} {cumulative / 1000:8.1f} ms")
+    if imports["total_ms"] > args.max_import_ms:
+        failures.append(f"import took {imports['total_ms']:.0f} ms")
+    if imports["heavy_loaded"]:
+        failures.append(f"imported at startup: {imports['heavy_loaded']}")
+
+    frame = first_frame()
+    if frame is None:
+        print("first frame: skipped, no display")
+    else:
+        print(f"first frame: {frame['first_frame_ms']:.0f} ms")
+        if frame["first_frame_ms"] > args.max_first_frame_ms:
+            failures.append(
+                f"first frame took {frame['first_frame_ms']:.0f} ms")
+        if frame["heavy_loaded"]:
+            failures.append(
+                f"loaded before first frame: {frame['heavy_loaded']}")
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Recorded session fixtures
+# A fastf1 cache holding a few real sessions. Recording needs the network
+# once, after that the benchmarks load the sessions in offline mode.
+#   python benchmarks/fixtures.py            record the default sessions
+#   python benchmarks/fixtures.py 2023 Monaco Qualifying
+
+FIXTURES_DIR = os.environ.get(
+    "F1_BENCH_FIXTURES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+RECORDED = [
+    (2023, "Bahrain", "Practice 1"),
+    (2023, "Bahrain", "Practice 2"),
+    (2023, "Bahrain", "Practice 3"),
+    (2023, "Bahrain", "Qualifying"),
+    (2023, "Bahrain", "Race"),
+]
+
+
+def _cache(path, offline):
+    import fastf1
+
+    os.makedirs(path, exist_ok=True)
+    fastf1.Cache.enable_cache(path)
+    fastf1.Cache.offline_mode(offline)
+
+
+def record(sessions=RECORDED, path=FIXTURES_DIR, data="car_data"):
+    import session_cache
+
+    _cache(path, offline=False)
+    for year, gp, name in sessions:
+        session_cache.load(year, gp, name, data)
+        print(f"recorded {year} {gp} {name}")
+
+
+def available(path=FIXTURES_DIR):
+    return os.path.isdir(path) and any(os.scandir(path))
+
+
+def load(year, gp, name, data="laps", path=FIXTURES_DIR):
+    # Only ever served from the fixture cache, never from the network
+    import session_cache
+
+    _cache(path, offline=True)
+    return session_cache.load(year, gp, name, data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Record sessions into the benchmark fixture cache")
+    parser.add_argument("session", nargs="*",
+                        help="year, gp and session name, defaults to the Bahrain 2023 weekend")
+    parser.add_argument("--path", default=FIXTURES_DIR)
+    args = parser.parse_args(argv)
+
+    sessions = RECORDED
+    if args.session:
+        if len(args.session) != 3:
+            parser.error("expected a year, a gp and a session name")
+        sessions = [(int(args.session[0]), args.session[1], args.session[2])]
+    record(sessions, args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+
+import decimate  # noqa: E402
+import degradation  # noqa: E402
+import plotting  # noqa: E402
+import predictor  # noqa: E402
+import season_index  # noqa: E402
+import telemetry  # noqa: E402
+import track_map  # noqa: E402
+import fixtures  # noqa: E402
+import synthetic  # noqa: E402
+
+# Benchmark suite
+# Every case is timed over synthetic data at 1x, 10x and 100x the size of a
+# real weekend, plus the recorded sessions when the fixture cache exists.
+# Results are written as JSON and can be compared against an earlier run.
+#   python benchmarks/run.py -o before.json
+#   python benchmarks/run.py --compare before.json --threshold 0.2
+
+FORMAT_VERSION = 1
+SCALES = (1, 10, 100)
+# Laps per practice session at scale 1
+PRACTICE_LAPS = 600
+SEASONS = range(2003, 2023)
+THEME = plotting.dark_theme("#161A1D", "#F5F3F4")
+
+
+class AggCanvas(FigureCanvasAgg):
+    # Takes the place of the Tk canvas so the plot classes render headless
+    def __init__(self, figure, master=None):
+        super().__init__(figure)
+
+    def get_tk_widget(self):
+        return None
+
+    def blit(self, bbox=None):
+        pass
+
+
+plotting.FigureCanvasTkAgg = AggCanvas
+
+# name -> (setup, scaled, recorded), setup(scale) returns the function to time
+CASES = {}
+
+
+def case(name, scaled=True, recorded=False):
+    def register(setup):
+        CASES[name] = (setup, scaled, recorded)
+        return setup
+    return register
+
+
+# Prediction
+def _predict_case(method):
+    def setup(scale):
+        practices = synthetic.practice_weekend(PRACTICE_LAPS * scale)
+        return lambda: predictor.predict(practices, method=method)
+    return setup
+
+
+for _method in predictor.AGGREGATIONS:
+    case(f"predict.{_method}")(_predict_case(_method))
+
+
+# Stint fitting
+@case("degradation.analyse")
+def degradation_analyse(scale):
+    laps = synthetic.race_laps(scale)
+    return lambda: degradation.analyse(laps)
+
+
+# Delta computation
+@case("telemetry.compare")
+def telemetry_compare(scale):
+    laps = synthetic.session_telemetry(scale)
+    return lambda: telemetry.compare(laps).summary()
+
+
+@case("telemetry.decimate")
+def telemetry_decimate(scale):
+    lap = synthetic.lap_telemetry(scale)
+    return lambda: decimate.level_of_detail(lap["Distance"], lap["Speed"], 1200)
+
+
+# Rendering
+@case("render.telemetry")
+def render_telemetry(scale):
+    plot = plotting.TelemetryPlot(None, THEME, "#ED00FF")
+    laps = synthetic.session_telemetry(scale, synthetic.DRIVER_CODES[:3])
+    frames = {driver: synthetic.car_data(lap) for driver, lap in laps.items()}
+    reference = frames[synthetic.DRIVER_CODES[0]]
+
+    updates = []
+    for driver in synthetic.DRIVER_CODES[1:3]:
+        delta = np.interp(reference["Distance"], frames[driver]["Distance"],
+                          laps[driver]["Time"]) - laps[synthetic.DRIVER_CODES[0]]["Time"]
+        updates.append((driver, "#3A86FF", frames[driver], delta, frames[driver], reference))
+
+    # Alternating drivers is what picking from the driver list does
+    state = {"next": 0}
+
+    def render():
+        plot.update(*updates[state["next"] % len(updates)])
+        state["next"] += 1
+    return render
+
+
+@case("render.comparison")
+def render_comparison(scale):
+    plot = plotting.ComparisonPlot(None, THEME, telemetry.CHANNELS)
+    comparison = telemetry.compare(synthetic.session_telemetry(scale))
+    colors = [plotting.matplotlib.colormaps["tab20"](i) for i in range(len(comparison.drivers))]
+    return lambda: plot.update(comparison, colors)
+
+
+@case("render.degradation")
+def render_degradation(scale):
+    clean, fits = degradation.analyse(synthetic.race_laps(scale))
+    figure, ax = plotting.themed_figure(THEME, (12, 5))
+    canvas = FigureCanvasAgg(figure)
+
+    def render():
+        plotting.clear_axes(ax, THEME)
+        degradation.plot(ax, clean, fits)
+        canvas.draw()
+    return render
+
+
+@case("render.track_map")
+def render_track_map(scale):
+    lap = synthetic.lap_telemetry(scale)
+    angle = lap["Distance"] / lap["Distance"][-1] * 2 * np.pi
+    geometry = track_map.CircuitGeometry.from_lap(pd.DataFrame({
+        "Distance": lap["Distance"], "X": 1500 * np.cos(angle), "Y": 900 * np.sin(angle)}))
+    plot = track_map.TrackMapPlot(None, THEME)
+
+    def render():
+        plot.update(geometry, geometry.values(lap["Distance"], lap["Speed"]), "Speed", ["VER"])
+    return render
+
+
+# Season metadata
+def _season_index(rounds):
+    return season_index.SeasonIndex(
+        ":memory:", lambda year: synthetic.season_schedule(year, rounds), synthetic.season_drivers)
+
+
+@case("season.build")
+def season_build(scale):
+    def build():
+        index = _season_index(22 * scale)
+        index.build(SEASONS)
+        index.close()
+    return build
+
+
+@case("season.lookup")
+def season_lookup(scale):
+    index = _season_index(22 * scale)
+    index.build(SEASONS)
+
+    def lookup():
+        for year in SEASONS:
+            races, _ = index.season(year)
+            index.sessions(year, races[-1])
+    return lookup
+
+
+# Recorded sessions
+def _recorded(name, data="laps"):
+    year, gp, _ = fixtures.RECORDED[0]
+    return fixtures.load(year, gp, name, data)
+
+
+@case("recorded.load", scaled=False, recorded=True)
+def recorded_load(scale):
+    year, gp, _ = fixtures.RECORDED[0]
+    return lambda: fixtures.load(year, gp, "Qualifying", "car_data")
+
+
+@case("recorded.delta_time", scaled=False, recorded=True)
+def recorded_delta_time(scale):
+    from fastf1 import utils
+
+    session = _recorded("Qualifying", "car_data")
+    fastest = session.laps.pick_fastest()
+    other = session.laps.pick_drivers(
+        session.results["Abbreviation"].iloc[1]).pick_fastest()
+    return lambda: utils.delta_time(other, fastest)
+
+
+@case("recorded.compare", scaled=False, recorded=True)
+def recorded_compare(scale):
+    session = _recorded("Qualifying", "car_data")
+    drivers = list(session.results["Abbreviation"].iloc[:10])
+    return lambda: telemetry.compare_session(session, drivers)
+
+
+@case("recorded.predict", scaled=False, recorded=True)
+def recorded_predict(scale):
+    practices = [_recorded(name).laps for name in ("Practice 1", "Practice 2", "Practice 3")]
+    return lambda: predictor.predict(practices)
+
+
+@case("recorded.degradation", scaled=False, recorded=True)
+def recorded_degradation(scale):
+    laps = _recorded("Race").laps
+    return lambda: degradation.analyse(laps)
+
+
+def measure(function, repeat):
+    function()
+    times = timeit.repeat(function, number=1, repeat=repeat)
+    return {"repeat": repeat,
+            "min_ms": round(min(times) * 1000, 4),
+            "median_ms": round(statistics.median(times) * 1000, 4)}
+
+
+def run(patterns=("*",), scales=SCALES, repeat=5):
+    results = {}
+    have_fixtures = fixtures.available()
+
+    for name, (setup, scaled, recorded) in CASES.items():
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        if recorded and not have_fixtures:
+            print(f"{name:<28} skipped, no recorded fixtures")
+            continue
+
+        for scale in (scales if scaled else (1,)):
+            label = f"{name}@{scale}x" if scaled else name
+            # The largest cases are slow enough that fewer runs are representative
+            runs = repeat if scale < 100 else max(1, repeat // 3)
+            result = measure(setup(scale), runs)
+            results[label] = dict(result, case=name, scale=scale)
+            print(f"{label:<28} {result['min_ms']:10.2f} ms  (median {result['median_ms']:.2f} ms, {runs} runs)")
+
+    return results
+
+
+def report(results):
+    return {
+        "version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "results": dict(sorted(results.items())),
+    }
+
+
+def compare(old, new, threshold=0.2):
+    # Regressions are cases whose best time grew by more than the threshold
+    regressions = []
+    for label, result in sorted(new["results"].items()):
+        before = old["results"].get(label)
+        if before is None:
+            print(f"{label:<28} new")
+            continue
+
+        change = result["min_ms"] / before["min_ms"] - 1 if before["min_ms"] else 0.0
+        print(f"{label:<28} {before['min_ms']:10.2f} ms -> {result['min_ms']:10.2f} ms  {change:+7.1%}")
+        if change > threshold:
+            regressions.append(f"{label} {change:+.1%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("cases", nargs="*", default=["*"],
+                        help="case name patterns, e.g. 'predict.*' or 'render.*'")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", "-o", default=None,
+                        help="JSON file for the results")
+    parser.add_argument("--compare", default=None,
+                        help="earlier results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (_, scaled, recorded) in CASES.items():
+            print(f"{name:<28} {'recorded' if recorded else 'scaled' if scaled else ''}")
+        return 0
+
+    results = report(run(args.cases, args.scales, args.repeat))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# Synthetic timing data for benchmarks
+# Practice and race laps, lap telemetry and season metadata shaped like the
+# fastf1 and Ergast data the app works with, sized by a scale factor.
+
+DRIVER_CODES = ["VER", "PER", "LEC", "SAI", "HAM", "RUS", "NOR", "PIA", "ALO", "STR",
+                "OCO", "GAS", "ALB", "SAR", "BOT", "ZHO", "MAG", "HUL", "TSU", "RIC"]
+COMPOUNDS = ["SOFT", "MEDIUM", "HARD"]
+# Sizes at scale 1, close to a real race and a real lap of car data
+RACE_LAPS = 57
+LAP_SAMPLES = 700
+LAP_LENGTH = 5400.0
+
+
+def practice_laps(n_laps=2000, drivers=DRIVER_CODES, seed=0):
+    rng = np.random.default_rng(seed)
+
+    driver = rng.choice(drivers, n_laps)
+    sectors = {}
+    for number, base in enumerate((28.0, 38.0, 24.0), start=1):
+        seconds = base + rng.gamma(2.0, 0.4, n_laps)
+        sectors[f"Sector{number}Time"] = pd.to_timedelta(seconds, unit="s")
+
+    laps = pd.DataFrame({"Driver": driver, **sectors})
+    laps["LapTime"] = laps["Sector1Time"] + \
+        laps["Sector2Time"] + laps["Sector3Time"]
+    laps["Stint"] = rng.integers(1, 6, n_laps).astype(float)
+    laps["Compound"] = rng.choice(COMPOUNDS, n_laps)
+    laps["IsAccurate"] = rng.random(n_laps) > 0.15
+
+    # Some sector times are missing, as they are in real timing data
+    for sector in ("Sector1Time", "Sector2Time", "Sector3Time"):
+        laps.loc[rng.random(n_laps) < 0.02, sector] = pd.NaT
+
+    return laps
+
+
+def practice_weekend(n_laps=2000, seed=0):
+    return [practice_laps(n_laps, seed=seed + i) for i in range(3)]
+
+
+def race_laps(scale=1, drivers=DRIVER_CODES, seed=0):
+    rng = np.random.default_rng(seed)
+    total = RACE_LAPS * scale
+    n_drivers = len(drivers)
+
+    lap_number = np.tile(np.arange(1, total + 1), n_drivers)
+    driver = np.repeat(drivers, total)
+
+    # Two or three stints per race distance, pit stops at random laps
+    stint = np.ones(total * n_drivers)
+    tyre_life = np.zeros(total * n_drivers)
+    compound = np.empty(total * n_drivers, dtype=object)
+    pit_in = np.zeros(total * n_drivers, dtype=bool)
+    for i in range(n_drivers):
+        stops = np.sort(rng.choice(np.arange(10, total - 5), rng.integers(1, 3) * scale, replace=False))
+        laps = slice(i * total, (i + 1) * total)
+        stint[laps] = 1 + np.searchsorted(stops, np.arange(1, total + 1), side="left")
+        starts = np.concatenate([[1], stops + 1])
+        tyre_life[laps] = np.arange(1, total + 1) - starts[stint[laps].astype(int) - 1] + 1
+        compound[laps] = rng.choice(COMPOUNDS, len(starts))[stint[laps].astype(int) - 1]
+        pit_in[i * total + stops - 1] = True
+
+    wear = np.select([compound == "SOFT", compound == "MEDIUM"], [0.09, 0.06], 0.04)
+    fuel = 110.0 * (1 - (lap_number - 1) / total) * 0.03
+    seconds = 92.0 + wear * tyre_life + fuel + rng.gamma(2.0, 0.15, len(lap_number))
+
+    pit_out = np.zeros_like(pit_in)
+    pit_out[1:] = pit_in[:-1] & (lap_number[1:] > 1)
+    laps = pd.DataFrame({
+        "Driver": driver,
+        "LapNumber": lap_number.astype(float),
+        "LapTime": pd.to_timedelta(seconds, unit="s"),
+        "Stint": stint,
+        "Compound": compound,
+        "TyreLife": tyre_life,
+        "PitInTime": pd.to_timedelta(np.where(pit_in, 3600.0, np.nan), unit="s"),
+        "PitOutTime": pd.to_timedelta(np.where(pit_out, 3600.0, np.nan), unit="s"),
+        "IsAccurate": rng.random(len(lap_number)) > 0.05,
+        "TrackStatus": np.where(rng.random(len(lap_number)) < 0.03, "4", "1"),
+    })
+    return laps
+
+
+def lap_telemetry(scale=1, seed=0, lap_time=90.0):
+    # One lap of car data in the dict layout telemetry.lap_telemetry returns
+    rng = np.random.default_rng(seed)
+    n = LAP_SAMPLES * scale
+
+    time = np.sort(rng.uniform(0, lap_time, n))
+    time[0], time[-1] = 0.0, lap_time
+    phase = time / lap_time * 2 * np.pi
+    speed = 210 + 90 * np.sin(7 * phase) + 15 * np.sin(3 * phase + seed) + rng.normal(0, 2, n)
+    speed = np.clip(speed, 70, 340)
+
+    distance = np.concatenate([[0.0], np.cumsum(np.diff(time) * speed[1:] / 3.6)])
+    distance *= LAP_LENGTH / distance[-1]
+    throttle = np.clip((speed - 120) / 1.6, 0, 100)
+
+    return {
+        "Distance": distance,
+        "Time": time,
+        "Speed": speed,
+        "Throttle": throttle,
+        "Brake": (np.gradient(speed) < -1.5).astype(float),
+        "nGear": np.clip(np.round(speed / 42), 1, 8),
+        "RPM": 9000 + 2500 * ((speed % 42) / 42),
+        "LapTime": lap_time,
+    }
+
+
+def session_telemetry(scale=1, drivers=DRIVER_CODES, seed=0):
+    rng = np.random.default_rng(seed)
+    return {driver: lap_telemetry(scale, seed + i, 89.0 + rng.gamma(2.0, 0.4))
+            for i, driver in enumerate(drivers)}
+
+
+def car_data(telemetry):
+    # fastf1 style DataFrames for the plot code
+    frame = pd.DataFrame({k: v for k, v in telemetry.items() if k not in ("Time", "LapTime")})
+    frame["Time"] = pd.to_timedelta(telemetry["Time"], unit="s")
+    return frame
+
+
+def season_schedule(year, rounds=22):
+    events = []
+    for round in range(1, rounds + 1):
+        country = f"Country{round}"
+        events.append((round, f"{country} Grand Prix", f"{country} Grand Prix", country,
+                       f"Circuit{round}", f"{year}-03-{(round % 28) + 1:02d}T00:00:00",
+                       "conventional", "Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"))
+    return events
+
+
+def season_drivers(year, drivers=DRIVER_CODES):
+    return [(code, code.lower(), f"Driver {code}") for code in drivers]
@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+import telemetry
+
+# Compact laps and telemetry
+# What the analyses read from a session, held as small typed arrays:
+# driver, compound and session names as integer codes, times as int32
+# milliseconds and telemetry channels as float32 in one shared block.
+# Rows are grouped by driver so a driver's laps or a lap's telemetry is a
+# slice of those arrays rather than a copy.
+
+# Column -> storage kind
+LAP_FIELDS = {
+    "Driver": "category",
+    "Session": "category",
+    "Compound": "category",
+    "TrackStatus": "category",
+    "LapNumber": "int",
+    "Stint": "int",
+    "TyreLife": "int",
+    "Time": "ms",
+    "LapTime": "ms",
+    "Sector1Time": "ms",
+    "Sector2Time": "ms",
+    "Sector3Time": "ms",
+    "PitInTime": "ms",
+    "PitOutTime": "ms",
+    "IsAccurate": "bool",
+}
+# Missing values of the integer kinds
+MISSING_MS = np.iinfo(np.int32).min
+MISSING_INT = -1
+TELEMETRY_CHANNELS = ["Distance", "Time"] + telemetry.CHANNELS
+
+
+def _encode(values, kind):
+    if kind == "category":
+        categorical = pd.Categorical(values.astype("string"))
+        codes = categorical.codes
+        dtype = np.int8 if len(categorical.categories) < 127 else np.int16
+        return codes.astype(dtype), np.asarray(categorical.categories, dtype=object)
+
+    if kind == "ms":
+        values = pd.to_timedelta(values)
+        missing = values.isna().to_numpy()
+        millis = np.round(values.to_numpy(dtype="timedelta64[ns]").astype(np.int64, copy=False)
+                          / 1e6)
+        millis[missing] = MISSING_MS
+        return millis.astype(np.int32), None
+
+    if kind == "int":
+        numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+        numbers[np.isnan(numbers)] = MISSING_INT
+        return numbers.astype(np.int16), None
+
+    return values.fillna(False).to_numpy(dtype=bool), None
+
+
+def _decode(array, kind, categories, categorical=False):
+    if kind == "category":
+        if categorical:
+            return pd.Categorical.from_codes(array.astype(np.int16), categories)
+        # Code -1 picks the trailing None
+        return np.append(categories, None)[array]
+
+    if kind == "ms":
+        missing = array == MISSING_MS
+        nanos = array.astype("timedelta64[ms]").astype("timedelta64[ns]")
+        nanos[missing] = np.timedelta64("NaT")
+        return nanos
+
+    if kind == "int":
+        numbers = array.astype(float)
+        numbers[array == MISSING_INT] = np.nan
+        return numbers
+
+    return array
+
+
+class LapTable:
+    def __init__(self, columns, categories, driver_offsets=None):
+        self.columns = columns
+        self.categories = categories
+        # Start row of every driver code, only set when rows are grouped by driver
+        self.driver_offsets = driver_offsets
+
+    @classmethod
+    def from_laps(cls, laps, session=None, group=True):
+        laps = pd.DataFrame(laps)
+        if session is not None:
+            laps = laps.assign(Session=session)
+
+        columns, categories = {}, {}
+        for name, kind in LAP_FIELDS.items():
+            if name in laps.columns:
+                columns[name], categories[name] = _encode(laps[name], kind)
+
+        if not group or "Driver" not in columns:
+            return cls(columns, categories)
+
+        # Group by driver, keeping the original order within a driver
+        order = np.argsort(columns["Driver"], kind="stable")
+        columns = {name: array[order] for name, array in columns.items()}
+        counts = np.bincount(columns["Driver"], minlength=len(categories["Driver"]))
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        return cls(columns, categories, offsets)
+
+    @classmethod
+    def from_sessions(cls, practices, names=None):
+        frames = []
+        for number, laps in enumerate(practices, start=1):
+            if laps is None or len(laps.index) == 0:
+                continue
+            frames.append(pd.DataFrame(laps).assign(
+                Session=names[number - 1] if names else number))
+        if not frames:
+            return cls({}, {})
+        return cls.from_laps(pd.concat(frames, ignore_index=True))
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.columns.values())
+
+    @property
+    def drivers(self):
+        return list(self.categories.get("Driver", []))
+
+    def driver(self, code):
+        # A view of one driver's rows, nothing is copied
+        codes = list(self.categories["Driver"])
+        if self.driver_offsets is None or code not in codes:
+            return LapTable({name: array[:0] for name, array in self.columns.items()},
+                            self.categories)
+
+        index = codes.index(code)
+        rows = slice(self.driver_offsets[index], self.driver_offsets[index + 1])
+        return LapTable({name: array[rows] for name, array in self.columns.items()},
+                        self.categories)
+
+    def take(self, rows):
+        return LapTable({name: array[rows] for name, array in self.columns.items()},
+                        self.categories)
+
+    def seconds(self, name):
+        # float seconds with NaN for missing times, for numeric work
+        array = self.columns[name]
+        seconds = array / 1000.0
+        seconds[array == MISSING_MS] = np.nan
+        return seconds
+
+    def frame(self, columns=None, categorical=False):
+        # The pandas layout the analyses take, built on demand
+        names = [name for name in (columns or LAP_FIELDS) if name in self.columns]
+        return pd.DataFrame({name: _decode(self.columns[name], LAP_FIELDS[name],
+                                           self.categories.get(name), categorical)
+                             for name in names})
+
+
+class TelemetryStore:
+    def __init__(self, data, index, channels=TELEMETRY_CHANNELS, lap_times=None):
+        # data holds one row per channel, index maps (driver, lap) to a column range
+        self.data = data
+        self.index = index
+        self.lap_times = lap_times or {}
+        self.channels = list(channels)
+        self._rows = {channel: row for row, channel in enumerate(self.channels)}
+
+    @classmethod
+    def from_laps(cls, laps, channels=TELEMETRY_CHANNELS):
+        # laps maps (driver, lap) to a dict of channel arrays
+        sizes = [len(values[channels[0]]) for values in laps.values()]
+        data = np.empty((len(channels), sum(sizes)), dtype=np.float32)
+
+        index, lapTimes, start = {}, {}, 0
+        for (key, values), size in zip(laps.items(), sizes):
+            for row, channel in enumerate(channels):
+                data[row, start:start + size] = values[channel]
+            index[key] = (start, start + size)
+            lapTimes[key] = float(values.get("LapTime", np.nan))
+            start += size
+        return cls(data, index, channels, lapTimes)
+
+    @classmethod
+    def from_session(cls, session, drivers, channels=TELEMETRY_CHANNELS):
+        # Fastest lap of every driver, keyed by (driver, "fastest")
+        car = [c for c in channels if c not in ("Distance", "Time")]
+        laps = telemetry.fastest_laps(session, drivers, car)
+        return cls.from_laps({(driver, "fastest"): values for driver, values in laps.items()},
+                             channels)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def lap(self, driver, lap="fastest"):
+        start, stop = self.index[(driver, lap)]
+        views = {channel: self.data[row, start:stop] for channel, row in self._rows.items()}
+        views["LapTime"] = self.lap_times.get((driver, lap), np.nan)
+        return views
+
+    def laps(self, drivers=None, lap="fastest"):
+        # driver -> channel views, the layout telemetry.compare() takes
+        drivers = drivers if drivers is not None else [key[0] for key in self.index if key[1] == lap]
+        return {driver: self.lap(driver, lap) for driver in drivers if (driver, lap) in self.index}
+
+    def extend(self, other):
+        # Appends the laps of another store, laps already held are kept
+        fresh = {key: other.lap(*key) for key in other.index if key not in self.index}
+        if not fresh:
+            return self
+        merged = {key: self.lap(*key) for key in self.index}
+        merged.update(fresh)
+        return TelemetryStore.from_laps(merged, self.channels)
@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import profiling
+
+# Telemetry decimation
+# A lap has far more samples than the canvas has pixels, so plots get a
+# level of detail sized to the axis width. Full resolution is kept for
+# zoomed views and decimated arrays are cached per (session, driver, lap).
+
+
+def minmax(x, y, buckets):
+    n = len(x)
+    if buckets < 1 or n <= 2 * buckets:
+        return x, y
+
+    # Equal sized buckets, the min and max of each keep every spike visible
+    size = n // buckets
+    body = y[:size * buckets].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = [offsets + np.argmin(body, axis=1), offsets + np.argmax(body, axis=1)]
+
+    if size * buckets < n:
+        tail = y[size * buckets:]
+        keep.append(np.array([size * buckets + np.argmin(tail),
+                              size * buckets + np.argmax(tail)]))
+    keep.append(np.array([0, n - 1]))
+
+    index = np.unique(np.concatenate(keep))
+    return x[index], y[index]
+
+
+def lttb(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    # Largest triangle three buckets
+    every = (n - 2) / (threshold - 2)
+    index = np.empty(threshold, dtype=np.int64)
+    index[0] = 0
+    index[-1] = n - 1
+    a = 0
+
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        nextEnd = min(int((i + 2) * every) + 1, n)
+
+        if end < nextEnd:
+            avgX = x[end:nextEnd].mean()
+            avgY = y[end:nextEnd].mean()
+        else:
+            avgX, avgY = x[-1], y[-1]
+
+        area = np.abs((x[a] - avgX) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avgY - y[a]))
+        a = start + int(np.argmax(area))
+        index[i + 1] = a
+
+    return x[index], y[index]
+
+
+METHODS = {"minmax": minmax, "lttb": lttb}
+
+
+def visible(x, y, xlim):
+    if xlim is None:
+        return x, y
+
+    # One sample either side so lines reach the axis edges
+    first = max(np.searchsorted(x, xlim[0], side="left") - 1, 0)
+    last = min(np.searchsorted(x, xlim[1], side="right") + 1, len(x))
+    return x[first:last], y[first:last]
+
+
+def level_of_detail(x, y, width, xlim=None, method="minmax"):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x, y = visible(x, y, xlim)
+
+    # Zoomed in far enough the full resolution fits on screen
+    if method == "minmax":
+        return minmax(x, y, int(width))
+    return METHODS[method](x, y, 2 * int(width))
+
+
+class DecimationCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, x, y, width, xlim=None, method="minmax"):
+        if xlim is not None:
+            xlim = (round(float(xlim[0])), round(float(xlim[1])))
+        entry = (key, int(width), xlim, method)
+
+        if key is not None:
+            with self._lock:
+                if entry in self._entries:
+                    self._entries.move_to_end(entry)
+                    self.hits += 1
+                    return self._entries[entry]
+
+        result = level_of_detail(x, y, width, xlim, method)
+
+        if key is not None:
+            with self._lock:
+                self.misses += 1
+                self._entries[entry] = result
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+cache = DecimationCache()
+profiling.register("decimate", cache.stats)
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# Tyre degradation engine
+# Laps are split into stints, corrected for fuel burn and every stint of
+# every driver is fitted with one vectorized least squares pass.
+
+# Typical race start fuel load and the lap time cost of carrying it
+START_FUEL_KG = 110.0
+SECONDS_PER_KG = 0.03
+# Laps slower than this factor of the driver's best clean lap are dropped
+OUTLIER_FACTOR = 1.07
+MIN_STINT_LAPS = 4
+
+COMPOUND_COLORS = {
+    "SOFT": "#DA291C",
+    "MEDIUM": "#FFD12E",
+    "HARD": "#F0F0EC",
+    "INTERMEDIATE": "#43B02A",
+    "WET": "#0067AD",
+}
+
+FIT_COLUMNS = ["Driver", "Stint", "Compound", "Laps", "FirstLap", "LastLap",
+               "Slope", "Intercept", "R2", "MeanLapTime"]
+
+
+def stint_laps(laps):
+    columns = ["Driver", "Stint", "Compound", "LapNumber", "TyreLife", "LapTime"]
+    clean = laps.dropna(subset=["LapTime", "Stint", "LapNumber"])
+
+    mask = np.ones(len(clean.index), dtype=bool)
+    # In and out laps are not representative of tyre wear
+    for column in ("PitInTime", "PitOutTime"):
+        if column in clean.columns:
+            mask &= clean[column].isna().to_numpy()
+    if "IsAccurate" in clean.columns:
+        mask &= clean["IsAccurate"].fillna(False).astype(bool).to_numpy()
+    # Green flag laps only
+    if "TrackStatus" in clean.columns:
+        mask &= (clean["TrackStatus"].astype(str) == "1").to_numpy()
+
+    clean = clean.loc[mask, [c for c in columns if c in clean.columns]].copy()
+    clean["LapSeconds"] = clean["LapTime"].dt.total_seconds()
+
+    if "TyreLife" not in clean.columns:
+        clean["TyreLife"] = clean.groupby(["Driver", "Stint"]).cumcount() + 1
+    if "Compound" not in clean.columns:
+        clean["Compound"] = "UNKNOWN"
+    clean["Compound"] = clean["Compound"].fillna("UNKNOWN")
+
+    best = clean.groupby("Driver")["LapSeconds"].transform("min")
+    return clean[clean["LapSeconds"] <= best * OUTLIER_FACTOR]
+
+
+def fuel_correct(laps, total_laps=None, start_fuel=START_FUEL_KG,
+                 seconds_per_kg=SECONDS_PER_KG):
+    laps = laps.copy()
+    total_laps = total_laps or laps["LapNumber"].max()
+
+    remaining = start_fuel * (1 - (laps["LapNumber"] - 1) / total_laps)
+    laps["FuelCorrected"] = laps["LapSeconds"] - remaining.clip(lower=0) * seconds_per_kg
+    return laps
+
+
+def fit_stints(laps, y="FuelCorrected", min_laps=MIN_STINT_LAPS):
+    keys = ["Driver", "Stint", "Compound"]
+    x = laps["TyreLife"].to_numpy(dtype=float)
+    values = laps[y].to_numpy(dtype=float)
+
+    # Ordinary least squares from grouped sums, one pass for all stints
+    sums = pd.DataFrame({
+        "n": 1.0, "x": x, "y": values, "xx": x * x, "xy": x * values, "yy": values * values,
+        "lap": laps["LapNumber"].to_numpy(dtype=float),
+    }, index=laps.index)
+    for key in keys:
+        sums[key] = laps[key].to_numpy()
+
+    grouped = sums.groupby(keys, sort=True)
+    totals = grouped[["n", "x", "y", "xx", "xy", "yy"]].sum()
+    laps_range = grouped["lap"].agg(["min", "max"])
+
+    n = totals["n"]
+    sxx = totals["xx"] - totals["x"] ** 2 / n
+    sxy = totals["xy"] - totals["x"] * totals["y"] / n
+    syy = totals["yy"] - totals["y"] ** 2 / n
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = sxy / sxx
+        intercept = (totals["y"] - slope * totals["x"]) / n
+        r2 = (sxy * sxy) / (sxx * syy)
+
+    fits = pd.DataFrame({
+        "Laps": n.astype(int),
+        "FirstLap": laps_range["min"].astype(int),
+        "LastLap": laps_range["max"].astype(int),
+        "Slope": slope,
+        "Intercept": intercept,
+        "R2": r2,
+        "MeanLapTime": totals["y"] / n,
+    }).reset_index()
+
+    fits = fits[(fits["Laps"] >= min_laps) & np.isfinite(fits["Slope"])]
+    return fits[FIT_COLUMNS].reset_index(drop=True)
+
+
+def analyse(laps, total_laps=None, min_laps=MIN_STINT_LAPS):
+    clean = fuel_correct(stint_laps(laps), total_laps)
+    return clean, fit_stints(clean, min_laps=min_laps)
+
+
+def plot(ax, clean, fits, driver=None):
+    if driver is not None:
+        clean = clean[clean["Driver"] == driver]
+        fits = fits[fits["Driver"] == driver]
+
+    for compound, laps in clean.groupby("Compound"):
+        ax.scatter(laps["TyreLife"], laps["FuelCorrected"], s=8, alpha=0.5,
+                   color=COMPOUND_COLORS.get(compound, "grey"), label=compound)
+
+    # One line per stint through its fitted slope
+    for fit in fits.itertuples():
+        life = clean.loc[(clean["Driver"] == fit.Driver) &
+                         (clean["Stint"] == fit.Stint), "TyreLife"]
+        x = np.array([life.min(), life.max()])
+        ax.plot(x, fit.Intercept + fit.Slope * x,
+                color=COMPOUND_COLORS.get(fit.Compound, "grey"))
+
+    ax.set_xlabel("Tyre life in laps")
+    ax.set_ylabel("Fuel corrected lap time in s")
@@ -0,0 +1,162 @@
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+# Headless entry point
+#   python -m f1app predict --year 2022 --gp Bahrain
+#   python -m f1app degradation --year 2019-2022 --gp all --workers 4
+#   python -m f1app delta --year 2023 --gp Monaco --session Qualifying
+#   python -m f1app ingest --year 2018-2022 --gp all --store cache/laps
+
+ANALYSES = ("predict", "delta", "degradation", "ingest")
+
+
+def parse_years(text):
+    years = []
+    for part in str(text).split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            years.extend(range(int(first), int(last) + 1))
+        elif part.strip():
+            years.append(int(part))
+    return years
+
+
+def events(years, gps):
+    import season_index
+
+    for year in years:
+        if any(gp.lower() == "all" for gp in gps):
+            index = season_index.default_index()
+            # GP labels repeat within a season (two Italian rounds in 2022),
+            # the event name of each round does not
+            for round in range(1, len(index.races(year)) + 1):
+                event = index.event(year, round=round)
+                if event is not None:
+                    yield year, event["event_name"]
+        else:
+            for gp in gps:
+                yield year, gp
+
+
+def run_event(analysisName, year, gp, options):
+    import analysis
+    analysis.enable_cache(options.get("cache", analysis.CACHE_DIR))
+
+    store = None
+    if options.get("store"):
+        import lap_store
+        store = lap_store.LapStore(options["store"])
+
+    if analysisName == "predict":
+        result = analysis.predict_quali(
+            year, gp, options.get("drivers"), options.get("method", "best"), store=store)
+        result = result.reset_index().rename(columns={"index": "Driver"})
+        result.insert(1, "Position", range(1, len(result.index) + 1))
+    elif analysisName == "delta":
+        comparison = analysis.compare_drivers(
+            year, gp, options.get("session", "Qualifying"), options.get("drivers"))
+        result = comparison.summary()
+    elif analysisName == "degradation":
+        _, result = analysis.tyre_degradation(year, gp, store=store)
+    elif analysisName == "ingest":
+        if store is None:
+            raise ValueError("ingest needs --store")
+        written = analysis.ingest(year, gp, store)
+        result = pd.DataFrame(
+            {"Session": list(written), "Laps": list(written.values())})
+    else:
+        raise ValueError(f"Unknown analysis '{analysisName}'")
+
+    result.insert(0, "GP", gp)
+    result.insert(0, "Year", year)
+    return result
+
+
+def run(analysisName, eventList, options, workers=None):
+    frames = []
+    failures = []
+
+    # Single events stay in process, batches are spread across cores
+    if workers == 1 or len(eventList) == 1:
+        for year, gp in eventList:
+            try:
+                frames.append(run_event(analysisName, year, gp, options))
+            except Exception as error:
+                failures.append((year, gp, error))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_event, analysisName, year, gp, options): (year, gp)
+                       for year, gp in eventList}
+            for future in as_completed(futures):
+                year, gp = futures[future]
+                try:
+                    frames.append(future.result())
+                    print(f"{year} {gp} done", file=sys.stderr)
+                except Exception as error:
+                    failures.append((year, gp, error))
+
+    for year, gp, error in failures:
+        print(f"{year} {gp} failed: {error}", file=sys.stderr)
+
+    if not frames:
+        return pd.DataFrame(), failures
+
+    result = pd.concat(frames, ignore_index=True)
+    return result.sort_values(["Year", "GP"], kind="stable").reset_index(drop=True), failures
+
+
+def write(result, output):
+    if output is None or output == "-":
+        print(result.to_string(index=False))
+    elif output.endswith(".parquet"):
+        result.to_parquet(output, index=False)
+    else:
+        result.to_csv(output, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="f1app", description="Run the F1 analyses without the GUI")
+    parser.add_argument("analysis", choices=ANALYSES)
+    parser.add_argument("--year", required=True,
+                        help="year, range or list, e.g. 2022, 2019-2022 or 2021,2023")
+    parser.add_argument("--gp", nargs="+", required=True,
+                        help="one or more events, or 'all' for the whole season")
+    parser.add_argument("--session", default="Qualifying",
+                        help="session for the delta analysis")
+    parser.add_argument("--drivers", nargs="*", default=None,
+                        help="driver codes, defaults to everyone")
+    parser.add_argument("--method", default="best",
+                        help="predictor aggregation: best, median_top_n or long_run")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for batches, defaults to the core count")
+    parser.add_argument("--cache", default="./cache")
+    parser.add_argument("--store", default=None,
+                        help="Parquet lap store to read from, or to write to with ingest")
+    parser.add_argument("--output", "-o", default=None,
+                        help=".csv or .parquet file, prints a table when left out")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Before the season lookups, the first caller picks fastf1's cache
+    import analysis
+    analysis.enable_cache(args.cache)
+    eventList = list(events(parse_years(args.year), args.gp))
+    if not eventList:
+        print("No events to run", file=sys.stderr)
+        return 1
+    options = {"session": args.session, "drivers": args.drivers,
+               "method": args.method, "cache": args.cache, "store": args.store}
+    workers = args.workers or min(len(eventList), os.cpu_count() or 1)
+
+    result, failures = run(args.analysis, eventList, options, workers)
+    write(result, args.output)
+    return 1 if failures and result.empty else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import profiling
+
+# HTTP client
+# One pooled session for every web lookup, with bounded timeouts, backoff
+# retries, conditional GETs and an on-disk response cache.
+
+ERGAST_URL = os.environ.get("F1_ERGAST_URL", "http://ergast.com/api/f1")
+DEFAULT_CACHE_DIR = os.path.join("cache", "http")
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class CachedResponse:
+    def __init__(self, url, status, body, etag=None, last_modified=None,
+                 fetched_at=None, from_cache=False):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at or time.time()
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.body)
+
+    def to_dict(self):
+        return {"url": self.url, "status": self.status, "body": self.body,
+                "etag": self.etag, "last_modified": self.last_modified,
+                "fetched_at": self.fetched_at}
+
+
+class HttpClient:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, timeout=DEFAULT_TIMEOUT,
+                 retries=3, backoff=0.5, pool_size=4, max_age=0):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        # Cached responses younger than this are served without a request
+        self.max_age = max_age
+
+        retry = Retry(total=retries, connect=retries, read=retries,
+                      backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({"GET"}), respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def close(self):
+        self.session.close()
+
+    # On-disk cache
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _read_cache(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(url), mode='r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(from_cache=True, **entry)
+
+    def _write_cache(self, response):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(response.url)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(temporary, mode='w') as f:
+                json.dump(response.to_dict(), f)
+            os.replace(temporary, path)
+
+    def get(self, url, params=None, max_age=None):
+        if params:
+            url = requests.Request("GET", url, params=params).prepare().url
+        max_age = self.max_age if max_age is None else max_age
+
+        cached = self._read_cache(url)
+        if cached is not None and time.time() - cached.fetched_at < max_age:
+            profiling.count("http.cache_hit")
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            with profiling.span("http.get"):
+                response = self.session.get(
+                    url, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            # Serve the last good response when the endpoint is unreachable
+            if cached is not None:
+                profiling.count("http.stale")
+                return cached
+            raise
+
+        if response.status_code == 304 and cached is not None:
+            profiling.count("http.not_modified")
+            cached.fetched_at = time.time()
+            self._write_cache(cached)
+            return cached
+
+        response.raise_for_status()
+
+        result = CachedResponse(url, response.status_code, response.text,
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"))
+        self._write_cache(result)
+        return result
+
+    def get_json(self, url, params=None, max_age=None):
+        return self.get(url, params, max_age).json()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+        return _default
+
+
+def ergast(path, **kwargs):
+    return default_client().get_json(f"{ERGAST_URL}/{path.lstrip('/')}", **kwargs)
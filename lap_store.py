@@ -0,0 +1,178 @@
+import os
+import pandas as pd
+import session_cache
+
+# Lap store
+# Laps of every ingested session in one hive partitioned Parquet dataset
+# (Year/Round/Session), so cross season questions are a single filtered
+# scan instead of rebuilding dozens of Session objects. A venue can host
+# two rounds of one season, so events are told apart by round.
+
+DEFAULT_ROOT = os.path.join("cache", "laps")
+PARTITIONS = ["Year", "Round", "Session"]
+
+LAP_COLUMNS = ["Driver", "Team", "Time", "LapNumber", "LapTime", "Stint", "Compound", "TyreLife",
+               "Sector1Time", "Sector2Time", "Sector3Time", "IsAccurate",
+               "PitInTime", "PitOutTime", "TrackStatus"]
+EVENT_COLUMNS = ["Round", "EventName", "Country", "GP"]
+# Columns a GP name is looked up in, the most specific first
+EVENT_NAMES = ["EventName", "Location", "GP", "Country"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.fs
+    except ImportError as error:
+        raise ImportError(
+            "The lap store needs pyarrow, install it with 'pip install pyarrow'") from error
+    return pyarrow
+
+
+def session_laps(session, name=None):
+    laps = pd.DataFrame(session.laps)
+    laps = laps[[c for c in LAP_COLUMNS if c in laps.columns]].copy()
+
+    event = session.event
+    laps["Year"] = int(event["EventDate"].year)
+    laps["Round"] = int(event["RoundNumber"])
+    laps["EventName"] = event["EventName"]
+    laps["Country"] = event["Country"]
+    laps["GP"] = f"{event['Country']} Grand Prix"
+    laps["Location"] = event["Location"]
+    laps["Session"] = name or session.name
+
+    if "TrackStatus" in laps.columns:
+        laps["TrackStatus"] = laps["TrackStatus"].astype("string")
+    for column in ("Driver", "Team", "Compound"):
+        if column in laps.columns:
+            laps[column] = laps[column].astype("string")
+    return laps
+
+
+class LapStore:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.pa = _pyarrow()
+        # Memory mapped reads, the OS pages in only what a scan touches
+        self.filesystem = self.pa.fs.LocalFileSystem(use_mmap=True)
+
+    def write(self, laps):
+        if len(laps.index) == 0:
+            return 0
+
+        pa = self.pa
+        table = pa.Table.from_pandas(laps, preserve_index=False)
+        os.makedirs(self.root, exist_ok=True)
+
+        # Re-ingesting a session replaces its partition
+        pa.dataset.write_dataset(
+            table, self.root, format="parquet", filesystem=self.filesystem,
+            partitioning=pa.dataset.partitioning(
+                table.select(PARTITIONS).schema, flavor="hive"),
+            existing_data_behavior="delete_matching",
+            basename_template="laps-{i}.parquet")
+        return table.num_rows
+
+    def ingest(self, year, gp, sessions):
+        written = {}
+        for name in sessions:
+            session = session_cache.load(year, gp, name, data="laps")
+            written[name] = self.write(session_laps(session, name))
+        return written
+
+    def _dataset(self):
+        pa = self.pa
+        return pa.dataset.dataset(self.root, format="parquet", filesystem=self.filesystem,
+                                  partitioning="hive")
+
+    def exists(self):
+        return os.path.isdir(self.root) and any(os.scandir(self.root))
+
+    def _filter(self, year=None, location=None, events=None, session=None, driver=None,
+                accurate_only=False):
+        field = self.pa.dataset.field
+        conditions = []
+
+        def matches(name, value):
+            if isinstance(value, range):
+                return (field(name) >= value.start) & (field(name) < value.stop)
+            if isinstance(value, (list, tuple, set)):
+                return field(name).isin(list(value))
+            return field(name) == value
+
+        def rounds(pairs):
+            condition = None
+            for eventYear, eventRound in pairs:
+                found = (field("Year") == eventYear) & (field("Round") == eventRound)
+                condition = found if condition is None else condition | found
+            return condition
+
+        # Partition keys prune whole directories before any file is opened
+        if year is not None:
+            conditions.append(matches("Year", year))
+        if location is not None:
+            conditions.append(matches("Location", location))
+        if session is not None:
+            conditions.append(matches("Session", session))
+        if events is not None:
+            conditions.append(rounds(events))
+        if driver is not None:
+            conditions.append(matches("Driver", driver))
+        if accurate_only:
+            conditions.append(field("IsAccurate") == True)  # noqa: E712
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def resolve(self, gp, year=None):
+        # (Year, Round) of the event a GP name stands for in each season,
+        # 'Bahrain', 'Sakhir' and 'Bahrain Grand Prix' all find the same round
+        values = list(gp) if isinstance(gp, (list, tuple, set)) else [gp]
+        stored = self.query(columns=["Year", "Round"] + EVENT_NAMES, year=year).drop_duplicates()
+
+        pairs = []
+        for value in values:
+            value = str(value).strip().lower()
+            for eventYear, season in stored.groupby("Year"):
+                for column in EVENT_NAMES:
+                    found = season.loc[season[column].str.lower() == value, "Round"].unique()
+                    if len(found) > 1:
+                        raise ValueError(
+                            f"'{gp}' matches rounds {sorted(int(r) for r in found)} of {eventYear}, "
+                            "use the event name")
+                    if len(found) == 1:
+                        pairs.append((int(eventYear), int(found[0])))
+                        break
+        return sorted(set(pairs))
+
+    def query(self, columns=None, gp=None, **filters):
+        if not self.exists():
+            return pd.DataFrame(columns=columns or [])
+
+        if gp is not None:
+            filters["events"] = self.resolve(gp, filters.get("year"))
+            if not filters["events"]:
+                return pd.DataFrame(columns=columns or [])
+
+        table = self._dataset().to_table(
+            columns=columns, filter=self._filter(**filters))
+        return table.to_pandas()
+
+    def events(self):
+        return self.query(columns=["Year", "Round", "EventName", "Location", "Session"]).drop_duplicates(
+        ).sort_values(["Year", "Round", "Session"]).reset_index(drop=True)
+
+
+_default = None
+
+
+def default_store():
+    global _default
+    if _default is None:
+        _default = LapStore(os.environ.get("F1_LAP_STORE", DEFAULT_ROOT))
+    return _default
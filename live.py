@@ -0,0 +1,193 @@
+import time
+import numpy as np
+import pandas as pd
+import compact
+import predictor
+
+# Live qualifying prediction
+# Keeps each driver's best sector times as a running minimum that is only
+# touched by newly arrived laps, so a refresh costs O(new laps) instead of
+# recomputing the whole weekend.
+
+SECTORS = predictor.SECTORS
+LAP_KEY = ["Session", "Driver", "LapNumber"]
+
+
+class LivePredictor:
+    def __init__(self, drivers=None):
+        self.roster = None if drivers is None else [
+            str(d).strip() for d in drivers]
+        self.drivers = []
+        self._rows = {}
+        # Best S1/S2/S3 per driver in seconds, grown as drivers appear
+        self.best = np.full((0, len(SECTORS)), np.inf)
+        self.laps_seen = 0
+
+    def _row(self, driver):
+        row = self._rows.get(driver)
+        if row is None:
+            row = len(self.drivers)
+            self._rows[driver] = row
+            self.drivers.append(driver)
+            self.best = np.vstack([self.best, np.full(len(SECTORS), np.inf)])
+        return row
+
+    def feed(self, laps):
+        if laps is None or len(laps.index) == 0:
+            return set()
+        self.laps_seen += len(laps.index)
+
+        laps = predictor.accurate_laps(laps, self.roster)
+        if len(laps.index) == 0:
+            return set()
+
+        seconds = pd.DataFrame({sector: laps[sector].dt.total_seconds()
+                                for sector in SECTORS})
+        seconds["Driver"] = laps["Driver"].to_numpy()
+        batch = seconds.groupby("Driver", sort=False)[SECTORS].min()
+
+        rows = np.array([self._row(driver) for driver in batch.index])
+        values = batch.to_numpy(dtype=float)
+        values[np.isnan(values)] = np.inf
+
+        before = self.best[rows].copy()
+        self.best[rows] = np.minimum(self.best[rows], values)
+        improved = np.any(self.best[rows] < before, axis=1)
+        return {driver for driver, changed in zip(batch.index, improved) if changed}
+
+    def frame(self):
+        # Same layout as predictor.predict()
+        result = pd.DataFrame(self.best, index=pd.Index(self.drivers, name="Driver"),
+                              columns=SECTORS)
+        result = result.replace(np.inf, np.nan).dropna()
+        result = result.apply(lambda seconds: pd.to_timedelta(seconds, unit="s"))
+        result["IdealLap"] = result[SECTORS].sum(axis=1)
+        return result.sort_values("IdealLap", kind="stable")
+
+    def reset(self):
+        self.__init__(self.roster)
+
+
+class ReplaySource:
+    # Replays recorded laps in session time order, speed 60 plays a minute
+    # of the session per second. A replay can run for hours, so the laps are
+    # held in the compact layout and only each batch becomes a DataFrame.
+    def __init__(self, laps, speed=60.0, clock=time.monotonic, time_column="Time"):
+        laps = laps.dropna(subset=[time_column])
+        laps = laps.sort_values(time_column, kind="stable").reset_index(drop=True)
+        self.laps = compact.LapTable.from_laps(laps, group=False)
+        self.speed = speed
+        self.clock = clock
+
+        times = laps[time_column].dt.total_seconds().to_numpy()
+        self.times = times - times.min() if len(times) else times
+
+        self.start = None
+        self.cursor = 0
+
+    @classmethod
+    def from_sessions(cls, practices, speed=60.0, clock=time.monotonic):
+        # Sessions are played back to back on one timeline
+        frames = []
+        offset = pd.Timedelta(0)
+        for prac in practices:
+            if prac is None or len(prac.index) == 0 or "Time" not in prac.columns:
+                continue
+            replayTime = prac["Time"] - prac["Time"].min() + offset
+            offset = replayTime.max()
+            frames.append(prac.assign(ReplayTime=replayTime))
+
+        if not frames:
+            raise ValueError("No laps to replay")
+        return cls(pd.concat(frames, ignore_index=True), speed, clock, "ReplayTime")
+
+    @property
+    def finished(self):
+        return self.cursor >= len(self.times)
+
+    def poll(self):
+        now = self.clock()
+        if self.start is None:
+            self.start = now
+
+        elapsed = (now - self.start) * self.speed
+        end = int(np.searchsorted(self.times, elapsed, side="right"))
+        batch = self.laps.take(slice(self.cursor, max(self.cursor, end))).frame()
+        self.cursor = max(self.cursor, end)
+        return batch
+
+
+class PollingSource:
+    # Calls fetch() for the laps known so far and hands on only the laps
+    # past the highest lap number already seen for each session and driver
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.seen = pd.Series(dtype=float, index=pd.MultiIndex.from_arrays(
+            [[], []], names=LAP_KEY[:2]))
+
+    @property
+    def finished(self):
+        return getattr(self.fetch, "finished", False)
+
+    def poll(self):
+        laps = self.fetch()
+        if laps is None or len(laps.index) == 0:
+            return laps
+
+        laps = laps.dropna(subset=LAP_KEY)
+        keys = pd.MultiIndex.from_frame(laps[LAP_KEY[:2]])
+        # NaN marks a driver not seen before, every lap of theirs is new
+        mark = self.seen.reindex(keys).to_numpy(dtype=float)
+        fresh = ~(laps["LapNumber"].to_numpy(dtype=float) <= mark)
+
+        latest = laps.groupby(LAP_KEY[:2])["LapNumber"].max()
+        self.seen = pd.concat([self.seen, latest]).groupby(level=[0, 1]).max()
+        return laps.loc[fresh]
+
+
+class PracticeFetcher:
+    # Practice sessions never run past this, a session older than that is
+    # loaded one last time and then left alone
+    SESSION_LENGTH = pd.Timedelta(minutes=90)
+
+    def __init__(self, year, gp, names=("Practice 1", "Practice 2", "Practice 3"),
+                 now=lambda: pd.Timestamp.now(tz="UTC")):
+        self.year = year
+        self.gp = gp
+        self.names = list(names)
+        self.now = now
+        self.ended = set()
+
+    @property
+    def finished(self):
+        return len(self.ended) == len(self.names)
+
+    def _ended(self, session):
+        start = pd.Timestamp(session.date)
+        if start.tzinfo is None:
+            start = start.tz_localize("UTC")
+        return self.now() > start + self.SESSION_LENGTH
+
+    def __call__(self):
+        import fastf1
+        import session_cache
+
+        frames = []
+        for name in self.names:
+            if name in self.ended:
+                continue
+            try:
+                # A fresh load each poll, past the session cache and fastf1's
+                # own request cache, either would hand back the first poll
+                with fastf1.Cache.disabled():
+                    session = session_cache.load(self.year, self.gp, name, data="laps")
+            except Exception:
+                continue
+            frames.append(pd.DataFrame(session.laps).assign(Session=name))
+            if self._ended(session):
+                self.ended.add(name)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def practice_fetcher(year, gp, names=("Practice 1", "Practice 2", "Practice 3")):
+    return PracticeFetcher(year, gp, names)
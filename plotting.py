@@ -0,0 +1,276 @@
+import math
+import matplotlib
+import numpy as np
+import decimate
+import profiling
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+
+# Plot rendering
+# Figures are created and themed once per frame, later selections only swap
+# the line data and blit the changed artists.
+
+
+def dark_theme(background, foreground):
+    return {
+        "figure.facecolor": background,
+        "axes.facecolor": background,
+        "axes.edgecolor": foreground,
+        "axes.labelcolor": foreground,
+        "xtick.color": foreground,
+        "ytick.color": foreground,
+        "text.color": foreground,
+        "legend.facecolor": background,
+        "legend.edgecolor": foreground,
+        "legend.labelcolor": foreground,
+    }
+
+
+def themed_figure(theme, figsize, dpi=100):
+    # Figure instead of plt.figure, so nothing is kept alive by pyplot
+    with matplotlib.rc_context(theme):
+        figure = Figure(figsize=figsize, dpi=dpi)
+        ax = figure.add_subplot(1, 1, 1)
+    return figure, ax
+
+
+def clear_axes(ax, theme):
+    with matplotlib.rc_context(theme):
+        ax.clear()
+
+
+def nice_limit(value, step):
+    if not math.isfinite(value) or value <= 0:
+        return step
+    return math.ceil(value / step) * step
+
+
+class BlitCanvas:
+    def __init__(self, figure, master, artists):
+        self.figure = figure
+        self.canvas = FigureCanvasTkAgg(figure, master)
+        self.artists = list(artists)
+        self.background = None
+
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def widget(self):
+        return self.canvas.get_tk_widget()
+
+    def _on_draw(self, event):
+        # Everything but the animated artists is kept as the background
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.figure.draw_artist(artist)
+
+    def redraw(self):
+        with profiling.span("render.draw"):
+            self.canvas.draw()
+
+    def blit(self):
+        if self.background is None:
+            self.redraw()
+            return
+
+        with profiling.span("render.blit"):
+            self.canvas.restore_region(self.background)
+            self._draw_artists()
+            self.canvas.blit(self.figure.bbox)
+
+
+class TelemetryPlot:
+    def __init__(self, master, theme, reference_color):
+        foreground = theme["text.color"]
+
+        # main speed plot
+        self.speedFigure, self.speedAX = themed_figure(theme, (12, 4))
+        self.speedLine, = self.speedAX.plot([], [])
+        self.speedAX.set_xlabel("Distance in m")
+        self.speedAX.set_ylabel("Speed in km/h")
+        with matplotlib.rc_context(theme):
+            self.speedLegend = self.speedAX.legend([self.speedLine], [""])
+
+        # delta plot with a secondary axis for the delta time
+        self.deltaFigure, self.deltaAX = themed_figure(theme, (12, 3))
+        self.refLine, = self.deltaAX.plot([], [])
+        self.compareLine, = self.deltaAX.plot([], [], color=reference_color)
+        with matplotlib.rc_context(theme):
+            self.twin = self.deltaAX.twinx()
+        self.deltaLine, = self.twin.plot([], [], '--', color=foreground)
+        self.deltaLabel = self.twin.text(
+            1.07, 0.5, "", rotation=90, va="center", ha="left", color=foreground, transform=self.twin.transAxes)
+
+        self.speedCanvas = BlitCanvas(
+            self.speedFigure, master, [self.speedLine, self.speedLegend])
+        self.deltaCanvas = BlitCanvas(self.deltaFigure, master, [
+            self.refLine, self.compareLine, self.deltaLine, self.deltaLabel])
+
+        self._limits = {}
+        self._series = {}
+        self._key = None
+        self._updating = False
+
+        # Zooming or resizing only re-decimates the data already loaded
+        for ax in (self.speedAX, self.deltaAX):
+            ax.callbacks.connect("xlim_changed", self._on_view_changed)
+        for canvas in (self.speedCanvas, self.deltaCanvas):
+            canvas.canvas.mpl_connect("resize_event", self._on_view_changed)
+
+    def widgets(self):
+        return self.speedCanvas.widget(), self.deltaCanvas.widget()
+
+    def _zoom(self, ax, name):
+        full = self._limits.get(name)
+        xlim = ax.get_xlim()
+        if full is None or (xlim[0] <= full[0][0] and xlim[1] >= full[0][1]):
+            return None
+        return xlim
+
+    def _apply(self):
+        for name, (line, limitsName, x, y) in self._series.items():
+            ax = line.axes
+            lineKey = None if self._key is None else (*self._key, name)
+            line.set_data(*decimate.cache.get(lineKey, x, y,
+                          ax.bbox.width, self._zoom(ax, limitsName)))
+
+    def _on_view_changed(self, event):
+        if self._updating or not self._series:
+            return
+        self._apply()
+        self.speedCanvas.redraw()
+        self.deltaCanvas.redraw()
+
+    def _set_limits(self, name, ax, xlim, ylim):
+        # Rounded limits stay the same for most drivers of a session, so
+        # those updates only need a blit
+        if self._limits.get(name) == (xlim, ylim):
+            return False
+
+        ax.set_xlim(*xlim)
+        ax.set_ylim(*ylim)
+        self._limits[name] = (xlim, ylim)
+        return True
+
+    def update(self, driverCode, driverColor, driverTelemetry, deltaTime, ref_tel, compare_tel, key=None):
+        distance = driverTelemetry['Distance'].to_numpy()
+        speed = driverTelemetry['Speed'].to_numpy()
+        self.speedLine.set_color(driverColor)
+        self.speedLegend.get_lines()[0].set_color(driverColor)
+        self.speedLegend.get_texts()[0].set_text(driverCode)
+        self.refLine.set_color(driverColor)
+
+        # Full resolution series, the lines only get their decimated view
+        refDistance = ref_tel['Distance'].to_numpy()
+        self._key = key
+        self._series = {
+            "speed": (self.speedLine, "speed", distance, speed),
+            "ref": (self.refLine, "delta", refDistance, ref_tel['Speed'].to_numpy()),
+            "compare": (self.compareLine, "delta", compare_tel['Distance'].to_numpy(),
+                        compare_tel['Speed'].to_numpy()),
+            "delta": (self.deltaLine, "delta", refDistance, np.asarray(deltaTime, dtype=float)),
+        }
+        self.deltaLabel.set_text(f"<-- Fastest ahead | {driverCode} ahead -->")
+
+        trackLength = nice_limit(max(distance.max(initial=0), ref_tel['Distance'].max(),
+                                     compare_tel['Distance'].max()), 250)
+        topSpeed = nice_limit(max(speed.max(initial=0), ref_tel['Speed'].max(),
+                                  compare_tel['Speed'].max()), 25)
+        deltaRange = nice_limit(abs(deltaTime).max(), 0.25)
+
+        self._updating = True
+        try:
+            speedChanged = self._set_limits(
+                "speed", self.speedAX, (0, trackLength), (0, topSpeed))
+            deltaChanged = self._set_limits(
+                "delta", self.deltaAX, (0, trackLength), (0, topSpeed))
+            deltaChanged |= self._set_limits(
+                "twin", self.twin, (0, trackLength), (-deltaRange, deltaRange))
+        finally:
+            self._updating = False
+        self._apply()
+
+        for canvas, changed in ((self.speedCanvas, speedChanged), (self.deltaCanvas, deltaChanged)):
+            if changed:
+                canvas.redraw()
+            else:
+                canvas.blit()
+
+
+class ComparisonPlot:
+    LABELS = {"Speed": "Speed in km/h", "Throttle": "Throttle %",
+              "Brake": "Brake", "nGear": "Gear", "RPM": "RPM"}
+
+    def __init__(self, master, theme, channels):
+        self.theme = theme
+        self.channels = list(channels)
+        ratios = [3] + [1] * (len(self.channels) - 1) + [2, 0.5]
+
+        with matplotlib.rc_context(theme):
+            self.figure = Figure(figsize=(12, 6.8), dpi=100)
+            axes = self.figure.subplots(len(ratios), 1, sharex=True,
+                                        gridspec_kw={"height_ratios": ratios, "hspace": 0.15})
+        self.channelAXs = dict(zip(self.channels, axes))
+        self.deltaAX = axes[-2]
+        self.dominanceAX = axes[-1]
+
+        for channel, ax in self.channelAXs.items():
+            ax.set_ylabel(self.LABELS.get(channel, channel), fontsize=8)
+        self.deltaAX.set_ylabel("Delta in s", fontsize=8)
+        self.dominanceAX.set_yticks([])
+        self.dominanceAX.set_xlabel("Distance in m")
+
+        # Line pools grow to the largest selection and are reused after that
+        self.lines = {ax: [] for ax in axes[:-1]}
+        self.dominance = self.dominanceAX.imshow(
+            np.zeros((1, 1)), aspect="auto", interpolation="nearest")
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master)
+
+    def widget(self):
+        return self.canvas.get_tk_widget()
+
+    def _lines(self, ax, count):
+        pool = self.lines[ax]
+        while len(pool) < count:
+            line, = ax.plot([], [], linewidth=1)
+            pool.append(line)
+        for line in pool[count:]:
+            line.set_visible(False)
+        return pool[:count]
+
+    def update(self, comparison, colors):
+        grid = comparison.grid
+        count = len(comparison.drivers)
+
+        rows = [(self.channelAXs[c], comparison.channels[c]) for c in self.channels]
+        rows.append((self.deltaAX, comparison.delta))
+
+        for ax, values in rows:
+            for line, row, color, driver in zip(self._lines(ax, count), values, colors, comparison.drivers):
+                line.set_data(grid, row)
+                line.set_color(color)
+                line.set_label(driver)
+                line.set_visible(True)
+            ax.relim(visible_only=True)
+            ax.autoscale_view()
+
+        speedAX = self.channelAXs[self.channels[0]]
+        with matplotlib.rc_context(self.theme):
+            speedAX.legend(handles=self._lines(speedAX, count), loc="lower right",
+                           ncol=min(count, 10), fontsize=7)
+
+        # mini sector dominance strip
+        edges = comparison.sector_edges()
+        self.dominance.set_data(comparison.dominance()[None, :])
+        self.dominance.set_cmap(ListedColormap(colors))
+        self.dominance.set_clim(-0.5, count - 0.5)
+        self.dominance.set_extent((edges[0], edges[-1], 0, 1))
+        self.dominanceAX.set_xlim(grid[0], grid[-1])
+
+        self.canvas.draw_idle()
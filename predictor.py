@@ -0,0 +1,120 @@
+import pandas as pd
+
+# Qualifying prediction engine
+# All practice sessions are concatenated once and every driver is reduced in
+# a single grouped pass instead of walking the laps row by row per driver.
+
+SECTORS = ["Sector1Time", "Sector2Time", "Sector3Time"]
+LAP_COLUMNS = ["Driver", "IsAccurate", "LapTime", "Stint"] + SECTORS
+
+AGGREGATIONS = ("best", "median_top_n", "long_run")
+
+
+def combine_practices(practices):
+    frames = []
+
+    for number, prac in enumerate(practices, start=1):
+        if prac is None or len(prac.index) == 0:
+            continue
+        if "Driver" not in prac.columns:
+            continue
+
+        columns = [c for c in LAP_COLUMNS if c in prac.columns]
+        frame = prac[columns].copy()
+        frame["Session"] = number
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=LAP_COLUMNS + ["Session"])
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def accurate_laps(laps, drivers=None):
+    if len(laps.index) == 0:
+        return laps
+
+    mask = laps["IsAccurate"].fillna(False).astype(bool).to_numpy(copy=True)
+
+    if drivers is not None:
+        roster = [str(d).strip() for d in drivers]
+        mask &= laps["Driver"].isin(roster).to_numpy()
+
+    return laps.loc[mask]
+
+
+def best_sectors(laps):
+    return laps.groupby("Driver", sort=False)[SECTORS].min()
+
+
+def median_top_n_sectors(laps, n=3):
+    columns = {}
+
+    for sector in SECTORS:
+        times = laps[["Driver", sector]].dropna()
+        times = times.sort_values(["Driver", sector], kind="stable")
+        top = times[times.groupby("Driver", sort=False).cumcount() < n]
+        columns[sector] = top.groupby("Driver")[sector].median()
+
+    return pd.DataFrame(columns)
+
+
+def long_run_pace(laps, min_laps=5):
+    if "LapTime" not in laps.columns or "Stint" not in laps.columns:
+        return pd.Series(dtype="timedelta64[ns]", name="LongRunPace")
+
+    runs = laps.dropna(subset=["LapTime", "Stint"])
+    keys = ["Driver", "Session", "Stint"]
+    length = runs.groupby(keys, sort=False)["LapTime"].transform("size")
+    runs = runs[length >= min_laps]
+
+    return runs.groupby("Driver")["LapTime"].median().rename("LongRunPace")
+
+
+def predict(practices, drivers=None, method="best", top_n=3, min_stint_laps=5):
+    if method not in AGGREGATIONS:
+        raise ValueError(
+            f"Unknown aggregation '{method}', expected one of {AGGREGATIONS}")
+
+    laps = accurate_laps(combine_practices(practices), drivers)
+
+    if len(laps.index) == 0:
+        return pd.DataFrame(columns=SECTORS + ["IdealLap"])
+
+    if method == "long_run":
+        result = long_run_pace(laps, min_stint_laps).to_frame()
+        result["IdealLap"] = result["LongRunPace"]
+    else:
+        if method == "median_top_n":
+            result = median_top_n_sectors(laps, top_n)
+        else:
+            result = best_sectors(laps)
+
+        # Only drivers with a time in every sector get an ideal lap
+        result = result.dropna(subset=SECTORS)
+        result["IdealLap"] = result[SECTORS].sum(axis=1)
+
+    result = result.dropna(subset=["IdealLap"])
+    return result.sort_values("IdealLap", kind="stable")
+
+
+def format_laptime(value):
+    if pd.isna(value):
+        return "-"
+
+    millis = int(round(pd.Timedelta(value).total_seconds() * 1000))
+    minutes, millis = divmod(millis, 60000)
+    return f"{minutes}:{millis // 1000:02d}.{millis % 1000:03d}"
+
+
+def format_durations(values):
+    # Vectorized format_laptime for a whole column
+    values = pd.to_timedelta(pd.Series(values))
+    missing = values.isna().to_numpy()
+
+    millis = (values.fillna(pd.Timedelta(0)).dt.total_seconds() * 1000).round().astype("int64")
+    minutes, millis = millis // 60000, millis % 60000
+    text = (minutes.astype(str) + ":" + (millis // 1000).astype(str).str.zfill(2) + "." +
+            (millis % 1000).astype(str).str.zfill(3)).to_numpy(dtype=object)
+    text[missing] = "-"
+    return text
@@ -0,0 +1,155 @@
+import itertools
+import os
+import queue
+import threading
+import time
+import profiling
+import session_cache
+
+# Weekend prefetch
+# Picking a GP queues background loads of that event's sessions, the one
+# the user is looking at first, so switching sessions within the weekend
+# is served from the session cache.
+
+DEFAULT_SESSIONS = ["Practice 1", "Practice 2",
+                    "Practice 3", "Qualifying", "Race"]
+# Sessions people open most come first after the selected one
+PRIORITY = ["Qualifying", "Race", "Sprint", "Sprint Qualifying", "Sprint Shootout",
+            "Practice 3", "Practice 2", "Practice 1"]
+DISK_BUDGET = 2 * 1024 ** 3
+
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def event_sessions(year, gp):
+    try:
+        import season_index
+        sessions = season_index.default_index().sessions(year, gp)
+    except Exception:
+        sessions = []
+    return sessions or DEFAULT_SESSIONS
+
+
+def priority_order(sessions, current=None):
+    def rank(name):
+        if name == current:
+            return -1
+        return PRIORITY.index(name) if name in PRIORITY else len(PRIORITY)
+    return sorted(sessions, key=rank)
+
+
+class PrefetchScheduler:
+    def __init__(self, load=session_cache.get_session, max_workers=2, disk_budget=DISK_BUDGET,
+                 cache_dir="./cache"):
+        self.load = load
+        self.max_workers = max_workers
+        self.disk_budget = disk_budget
+        self.cache_dir = cache_dir
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._workers = []
+        self._closed = False
+        self._disk = (0.0, 0)
+
+        self.status = {}
+
+    def schedule(self, year, gp, sessions=None, current=None, data="laps"):
+        sessions = priority_order(
+            sessions or event_sessions(year, gp), current)
+
+        with self._lock:
+            # A new selection replaces whatever was still queued
+            self._generation += 1
+            generation = self._generation
+            self._drain()
+            self.status = {}
+
+            for rank, name in enumerate(sessions):
+                key = (int(year), gp, name)
+                self.status[key] = "queued"
+                self._queue.put(
+                    (rank, next(self._sequence), generation, key, data))
+
+            self._start_workers()
+        return sessions
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+            self._drain()
+            for key, state in self.status.items():
+                if state == "queued":
+                    self.status[key] = "cancelled"
+
+    def shutdown(self):
+        self._closed = True
+        self.cancel()
+        for _ in self._workers:
+            self._queue.put((float("inf"), next(self._sequence), None, None, None))
+
+    def _drain(self):
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _start_workers(self):
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._work, name="f1-prefetch", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _over_budget(self):
+        if self.disk_budget is None:
+            return False
+
+        # Walking the cache is not free, the size is reused for a while and
+        # measured without the lock so scheduling never waits on the walk
+        with self._lock:
+            measured, size = self._disk
+        if time.monotonic() - measured > 30:
+            size = directory_size(self.cache_dir)
+            with self._lock:
+                self._disk = (time.monotonic(), size)
+        return size >= self.disk_budget
+
+    def _work(self):
+        while not self._closed:
+            _, _, generation, key, data = self._queue.get()
+            if key is None:
+                return
+
+            over_budget = self._over_budget()
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                if over_budget:
+                    self.status[key] = "skipped"
+                    continue
+                self.status[key] = "loading"
+
+            try:
+                with profiling.tagged("prefetch", background=True):
+                    self.load(*key, data=data)
+                state = "done"
+            except Exception:
+                state = "failed"
+
+            with self._lock:
+                if generation == self._generation:
+                    self.status[key] = state
@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Instrumentation
+# Timed spans around the slow paths (session loads, delta_time, prediction,
+# rendering) and counters from the caches, so a slow click can be traced to
+# the network, fastf1, pandas or matplotlib. Set F1_PROFILE=1 to log a
+# breakdown per action and F1_PROFILE_EXPORT=<file> to write the totals as
+# JSON on exit.
+
+log = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("F1_PROFILE", "") not in ("", "0")
+EXPORT_PATH = os.environ.get("F1_PROFILE_EXPORT")
+FORMAT_VERSION = 1
+
+
+def memory_bytes():
+    # Resident set size of this process, None where it cannot be read
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if peak > 1 << 32 else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Spans and counters are kept per (tag, name), the tag is the thread
+        # or task that recorded them
+        self._spans = {}
+        self._counters = {}
+        self._sources = {}
+        self._background = set()
+        self._local = threading.local()
+        self.last_action = None
+
+    def _tag(self):
+        return getattr(self._local, "tag", None) or threading.current_thread().name
+
+    @contextmanager
+    def tagged(self, tag, background=False):
+        # Puts everything recorded on this thread down to tag, background
+        # work such as prefetching is left out of action breakdowns
+        if background:
+            with self._lock:
+                self._background.add(tag)
+        previous = getattr(self._local, "tag", None)
+        self._local.tag = tag
+        try:
+            yield
+        finally:
+            self._local.tag = previous
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        key = (self._tag(), name)
+        with self._lock:
+            count, total, longest = self._spans.get(key, (0, 0.0, 0.0))
+            self._spans[key] = (count + 1, total + seconds,
+                                max(longest, seconds))
+
+    def count(self, name, value=1):
+        key = (self._tag(), name)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def register(self, name, stats):
+        # stats() returns a dict of numbers, read whenever a snapshot is taken
+        with self._lock:
+            self._sources[name] = stats
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self.last_action = None
+
+    def snapshot(self, background=True):
+        with self._lock:
+            skip = set() if background else set(self._background)
+            tagged = [(tag, name, values) for (tag, name), values in self._spans.items()
+                      if tag not in skip]
+            counters = {}
+            for (tag, name), value in self._counters.items():
+                if tag not in skip:
+                    counters[name] = counters.get(name, 0) + value
+            sources = dict(self._sources)
+
+        spans = {}
+        tags = {}
+        for tag, name, (count, total, longest) in tagged:
+            previous = spans.get(name, (0, 0.0, 0.0))
+            spans[name] = (previous[0] + count, previous[1] + total, max(previous[2], longest))
+            tags[tag] = tags.get(tag, 0.0) + total
+
+        for source, stats in sources.items():
+            try:
+                values = stats()
+            except Exception as error:
+                log.debug("Could not read %s stats: %s", source, error)
+                continue
+            for name, value in values.items():
+                if isinstance(value, (int, float)):
+                    counters[f"{source}.{name}"] = value
+
+        memory = memory_bytes()
+        if memory is not None:
+            counters["memory.rss_bytes"] = memory
+
+        return {
+            "version": FORMAT_VERSION,
+            "spans": {name: {"count": count, "total_ms": round(total * 1000, 3),
+                             "max_ms": round(longest * 1000, 3)}
+                      for name, (count, total, longest) in sorted(spans.items())},
+            "counters": dict(sorted(counters.items())),
+            "tags": {tag: {"total_ms": round(total * 1000, 3)}
+                     for tag, total in sorted(tags.items())},
+        }
+
+    @contextmanager
+    def action(self, name):
+        # Everything recorded while the action runs, on any thread but the
+        # background ones, is reported as its breakdown
+        before = self.snapshot(background=False)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.finish(name, before, start)
+
+    def begin(self, name):
+        # For actions that finish in a callback rather than a with block
+        return name, self.snapshot(background=False), time.perf_counter()
+
+    def end(self, token):
+        return self.finish(*token)
+
+    def finish(self, name, before, start):
+        breakdown = action_breakdown(name, before, self.snapshot(background=False),
+                                     time.perf_counter() - start)
+        self.last_action = breakdown
+        if ENABLED:
+            log.info(format_breakdown(breakdown))
+        return breakdown
+
+    def export(self, path):
+        with open(path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+def action_breakdown(name, before, after, elapsed):
+    spans = {}
+    for span, values in after["spans"].items():
+        previous = before["spans"].get(span, {"count": 0, "total_ms": 0.0})
+        count = values["count"] - previous["count"]
+        if count:
+            spans[span] = {"count": count,
+                           "total_ms": round(values["total_ms"] - previous["total_ms"], 3)}
+
+    counters = {}
+    for counter, value in after["counters"].items():
+        change = value - before["counters"].get(counter, 0)
+        if change:
+            counters[counter] = change
+
+    return {"action": name, "elapsed_ms": round(elapsed * 1000, 3),
+            "spans": spans, "counters": counters}
+
+
+def format_breakdown(breakdown):
+    parts = [f"{name} {values['total_ms']:.0f}ms"
+             + (f" x{values['count']}" if values["count"] > 1 else "")
+             for name, values in sorted(breakdown["spans"].items(),
+                                        key=lambda item: -item[1]["total_ms"])]
+    for name, change in sorted(breakdown["counters"].items()):
+        if name == "memory.rss_bytes":
+            parts.append(f"memory {change / 1024 ** 2:+.0f}MB")
+        elif not name.endswith(("bytes", "entries", "sessions", "hit_rate")):
+            parts.append(f"{name} {change:+g}")
+    return f"{breakdown['action']} {breakdown['elapsed_ms']:.0f}ms" + (
+        ": " + ", ".join(parts) if parts else "")
+
+
+def diff(old, new):
+    # Per span change in total and mean time between two exports
+    changes = {}
+    for name in sorted(set(old["spans"]) | set(new["spans"])):
+        before, after = old["spans"].get(name), new["spans"].get(name)
+        if before is None or after is None:
+            changes[name] = {"status": "added" if before is None else "removed"}
+            continue
+
+        old_mean = before["total_ms"] / before["count"]
+        new_mean = after["total_ms"] / after["count"]
+        changes[name] = {"old_mean_ms": round(old_mean, 3), "new_mean_ms": round(new_mean, 3),
+                         "change": round(new_mean / old_mean - 1, 4) if old_mean else None}
+    return changes
+
+
+recorder = Recorder()
+span = recorder.span
+tagged = recorder.tagged
+count = recorder.count
+register = recorder.register
+action = recorder.action
+begin = recorder.begin
+end = recorder.end
+snapshot = recorder.snapshot
+
+if EXPORT_PATH:
+    import atexit
+    atexit.register(recorder.export, EXPORT_PATH)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare two profiling exports")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args(argv)
+
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+
+    for name, change in diff(old, new).items():
+        if "status" in change:
+            print(f"{name:<28} {change['status']}")
+        else:
+            ratio = "" if change["change"] is None else f"{change['change']:+.1%}"
+            print(f"{name:<28} {change['old_mean_ms']:>10.2f}ms {change['new_mean_ms']:>10.2f}ms {ratio:>8}")
+
+
+if __name__ == "__main__":
+    main()
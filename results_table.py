@@ -0,0 +1,144 @@
+import customtkinter
+import numpy as np
+import pandas as pd
+import predictor
+
+# Results table
+# A fixed pool of labels shows a window onto the data, so tables with
+# thousands of rows cost the same to draw as a full grid and updates only
+# reconfigure the cells whose text changed.
+
+
+def format_column(values):
+    if pd.api.types.is_timedelta64_dtype(values):
+        return predictor.format_durations(values)
+    if pd.api.types.is_float_dtype(values):
+        text = values.map("{:.3f}".format).to_numpy(dtype=object)
+        text[values.isna().to_numpy()] = "-"
+        return text
+    return values.astype(str).to_numpy(dtype=object)
+
+
+class ResultsTable(customtkinter.CTkFrame):
+    def __init__(self, master, columns, visible_rows=20, widths=None, formatters=None,
+                 text_color="#F5F3F4", header_color="#660708", hover_color="#E5383B", **kwargs):
+        super().__init__(master, **kwargs)
+        self.columns = list(columns)
+        self.visible_rows = visible_rows
+        self.formatters = formatters or {}
+        self.text_color = text_color
+
+        self._data = pd.DataFrame(columns=self.columns)
+        self._text = {}
+        self._colors = None
+        self._order = np.arange(0)
+        self._offset = 0
+        self._sort = None
+        self._shown = {}
+
+        widths = widths or {}
+        font = customtkinter.CTkFont(size=12, weight="bold")
+
+        # Header buttons sort by their column
+        for column, name in enumerate(self.columns):
+            header = customtkinter.CTkButton(self, text=name, width=widths.get(name, 100), height=24,
+                                             fg_color=header_color, hover_color=hover_color, text_color=text_color,
+                                             command=lambda name=name: self.sort(name))
+            header.grid(row=0, column=column, padx=1, pady=(0, 2), sticky="ew")
+
+        # The label pool, created once
+        self._cells = []
+        for row in range(visible_rows):
+            cells = []
+            for column, name in enumerate(self.columns):
+                cell = customtkinter.CTkLabel(self, text="", width=widths.get(name, 100), height=22,
+                                              font=font, text_color=text_color, anchor="w")
+                cell.grid(row=row + 1, column=column, padx=1, sticky="ew")
+                cell.bind("<MouseWheel>", self._on_wheel)
+                cell.bind("<Button-4>", self._on_wheel)
+                cell.bind("<Button-5>", self._on_wheel)
+                cells.append(cell)
+            self._cells.append(cells)
+
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self._on_scroll)
+        self.scrollbar.grid(row=1, rowspan=visible_rows, column=len(self.columns), sticky="ns")
+
+    # Data
+    def set_data(self, data, colors=None):
+        self._data = data.reset_index(drop=True)
+        # Every cell is formatted once per update, one vectorized call per column
+        self._text = {name: self.formatters.get(name, format_column)(self._data[name])
+                      if name in self._data.columns else np.full(len(self._data.index), "", dtype=object)
+                      for name in self.columns}
+        self._colors = None if colors is None else np.asarray(colors, dtype=object)
+
+        if self._sort is not None:
+            self._apply_sort()
+        else:
+            self._order = np.arange(len(self._data.index))
+        self._offset = min(self._offset, self._max_offset())
+        self._render()
+
+    def sort(self, name):
+        if name not in self._data.columns:
+            return
+        ascending = not (self._sort == (name, True))
+        self._sort = (name, ascending)
+        self._apply_sort()
+        self._render()
+
+    def _apply_sort(self):
+        name, ascending = self._sort
+        if name not in self._data.columns:
+            self._order = np.arange(len(self._data.index))
+            return
+        order = self._data[name].sort_values(
+            ascending=ascending, kind="stable", na_position="last").index
+        self._order = order.to_numpy()
+
+    # Scrolling
+    def _max_offset(self):
+        return max(len(self._order) - self.visible_rows, 0)
+
+    def scroll_to(self, offset):
+        offset = int(min(max(offset, 0), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scroll(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self._order)))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.scroll_to(self._offset + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self._offset - 3)
+        else:
+            self.scroll_to(self._offset + 3)
+
+    # Drawing
+    def _render(self):
+        total = len(self._order)
+        for row, cells in enumerate(self._cells):
+            position = self._offset + row
+            if position < total:
+                index = self._order[position]
+                color = self.text_color if self._colors is None else self._colors[index]
+                values = [self._text[name][index] for name in self.columns]
+            else:
+                color, values = self.text_color, [""] * len(self.columns)
+
+            for column, (cell, text) in enumerate(zip(cells, values)):
+                # Untouched cells are left alone, configure is the slow part
+                if self._shown.get((row, column)) != (text, color):
+                    cell.configure(text=text, text_color=color)
+                    self._shown[(row, column)] = (text, color)
+
+        if total:
+            self.scrollbar.set(self._offset / total,
+                               min((self._offset + self.visible_rows) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
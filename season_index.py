@@ -0,0 +1,268 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+import profiling
+
+# Season index
+# Local SQLite store of the schedule and driver roster of every season, so
+# startup and year switches are served without any network round-trips.
+
+log = logging.getLogger(__name__)
+
+FIRST_YEAR = 2003
+DEFAULT_PATH = "season_index.db"
+# Ongoing seasons are refreshed after this many seconds
+ONGOING_MAX_AGE = 12 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    year INTEGER PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    complete INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    gp_name TEXT NOT NULL,
+    event_name TEXT NOT NULL,
+    country TEXT,
+    location TEXT,
+    event_date TEXT,
+    event_format TEXT,
+    session1 TEXT,
+    session2 TEXT,
+    session3 TEXT,
+    session4 TEXT,
+    session5 TEXT,
+    PRIMARY KEY (year, round)
+);
+CREATE INDEX IF NOT EXISTS events_by_name ON events (year, event_name);
+CREATE INDEX IF NOT EXISTS events_by_gp_name ON events (year, gp_name);
+CREATE TABLE IF NOT EXISTS drivers (
+    year INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    driver_id TEXT,
+    name TEXT,
+    PRIMARY KEY (year, code)
+);
+"""
+
+EVENT_COLUMNS = ["round", "gp_name", "event_name", "country", "location", "event_date",
+                 "event_format", "session1", "session2", "session3", "session4", "session5"]
+
+
+def fetch_schedule(year):
+    import fastf1
+    import pandas as pd
+    import session_cache
+
+    # The season can be fetched before the app has set fastf1 up
+    session_cache.enable_cache()
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    events = []
+
+    for _, row in pd.DataFrame(schedule).iterrows():
+        eventDate = row.get("EventDate")
+        events.append((
+            int(row["RoundNumber"]),
+            f"{row['Country']} Grand Prix",
+            row["EventName"],
+            row.get("Country"),
+            row.get("Location"),
+            None if pd.isna(eventDate) else pd.Timestamp(eventDate).isoformat(),
+            row.get("EventFormat"),
+            *(row.get(f"Session{i}") or None for i in range(1, 6)),
+        ))
+
+    return events
+
+
+def cached_schedule(year):
+    # Whatever fastf1 has cached, for a first run without a network
+    import fastf1
+    import session_cache
+
+    session_cache.enable_cache()
+    fastf1.Cache.offline_mode(True)
+    try:
+        return fetch_schedule(year)
+    finally:
+        fastf1.Cache.offline_mode(False)
+
+
+def fetch_drivers(year):
+    import http_client
+
+    for path in (f"{year}/2/drivers.json", f"{year}/drivers.json"):
+        data = http_client.ergast(path)
+        table = data["MRData"]["DriverTable"]["Drivers"]
+        if table:
+            break
+
+    return [(i.get('code') or i['driverId'][:3].upper(), i['driverId'],
+             f"{i.get('givenName', '')} {i.get('familyName', '')}".strip())
+            for i in table]
+
+
+class SeasonIndex:
+    def __init__(self, path=DEFAULT_PATH, fetch_schedule=fetch_schedule,
+                 fetch_drivers=fetch_drivers, max_age=ONGOING_MAX_AGE,
+                 fetch_cached=cached_schedule):
+        self.path = path
+        self.fetch_schedule = fetch_schedule
+        self.fetch_drivers = fetch_drivers
+        self.fetch_cached = fetch_cached
+        self.max_age = max_age
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # Freshness
+    def is_fresh(self, year):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at, complete FROM seasons WHERE year = ?", (year,)).fetchone()
+
+        if row is None:
+            return False
+
+        fetched_at, complete = row
+        return bool(complete) or time.time() - fetched_at < self.max_age
+
+    def invalidate(self, year=None):
+        with self._lock, self._db:
+            if year is None:
+                self._db.execute("DELETE FROM seasons")
+            else:
+                self._db.execute(
+                    "DELETE FROM seasons WHERE year = ?", (year,))
+
+    def refresh(self, year):
+        import pandas as pd
+
+        with profiling.span("season.fetch"):
+            events = self.fetch_schedule(year)
+            roster = self.fetch_drivers(year)
+
+        # A season is finished once its last event is in the past
+        dates = [e[5] for e in events if e[5]]
+        complete = year < datetime.today().year or (
+            bool(dates) and pd.Timestamp(max(dates)) < pd.Timestamp.today())
+        self._store(year, events, roster, time.time(), complete)
+
+    def _store(self, year, events, roster, fetched_at, complete):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM events WHERE year = ?", (year,))
+            self._db.execute("DELETE FROM drivers WHERE year = ?", (year,))
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO events (year, {', '.join(EVENT_COLUMNS)}) "
+                f"VALUES (?{', ?' * len(EVENT_COLUMNS)})",
+                [(year, *event) for event in events])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO drivers (year, code, driver_id, name) VALUES (?, ?, ?, ?)",
+                [(year, *driver) for driver in roster])
+            self._db.execute(
+                "INSERT OR REPLACE INTO seasons (year, fetched_at, complete) VALUES (?, ?, ?)",
+                (year, fetched_at, int(complete)))
+
+    def _fallback(self, year):
+        events = self.fetch_cached(year)
+        if not events:
+            raise ValueError(f"No cached schedule for {year}")
+        try:
+            roster = self.fetch_drivers(year)
+        except Exception:
+            roster = []
+        # Stored as stale, the next ensure() goes back to the network
+        self._store(year, events, roster, 0, False)
+
+    def ensure(self, year):
+        year = int(year)
+        if self.is_fresh(year):
+            return
+
+        try:
+            self.refresh(year)
+        except Exception as error:
+            # Serve what we have when the network is unavailable
+            if self._has_data(year):
+                log.warning("Could not refresh season %s: %s", year, error)
+                return
+            if self.fetch_cached is None:
+                raise
+            try:
+                self._fallback(year)
+            except Exception:
+                raise error
+            log.warning("Season %s served from the fastf1 cache: %s", year, error)
+
+    def build(self, years=None):
+        for year in years or range(FIRST_YEAR, datetime.today().year + 1):
+            self.ensure(year)
+
+    def _has_data(self, year):
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM events WHERE year = ? LIMIT 1", (year,)).fetchone() is not None
+
+    # Lookups
+    def races(self, year):
+        self.ensure(year)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT gp_name FROM events WHERE year = ? ORDER BY round", (int(year),)).fetchall()
+        return [row[0] for row in rows]
+
+    def drivers(self, year):
+        self.ensure(year)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT code FROM drivers WHERE year = ? ORDER BY code", (int(year),)).fetchall()
+        return [row[0] for row in rows]
+
+    def season(self, year):
+        return self.races(year), self.drivers(year)
+
+    def event(self, year, round=None, name=None):
+        self.ensure(year)
+
+        if round is not None:
+            query, args = "year = ? AND round = ?", (int(year), int(round))
+        elif name is not None:
+            query, args = "year = ? AND (event_name = ? OR gp_name = ?)", (
+                int(year), name, name)
+        else:
+            raise ValueError("Either round or name is required")
+
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE {query}", args).fetchone()
+
+        return None if row is None else dict(zip(EVENT_COLUMNS, row))
+
+    def sessions(self, year, name):
+        event = self.event(year, name=name)
+        if event is None:
+            return []
+        return [event[f"session{i}"] for i in range(1, 6) if event[f"session{i}"]]
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_index():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SeasonIndex(os.environ.get(
+                "F1_SEASON_INDEX", DEFAULT_PATH))
+        return _default
@@ -0,0 +1,184 @@
+import os
+import threading
+from collections import OrderedDict
+import fastf1
+import profiling
+
+# Session cache
+# Loaded Session objects shared by every frame, so picking another driver
+# from the same session does not parse the session again.
+
+# Session.load() arguments for each level of data a caller can ask for,
+# from the least to the most complete
+DATA_LEVELS = {
+    "laps": dict(laps=True, telemetry=False, weather=False, messages=False),
+    "car_data": dict(laps=True, telemetry=True, weather=False, messages=False),
+    "full": dict(laps=True, telemetry=True, weather=True, messages=True),
+}
+LEVEL_ORDER = list(DATA_LEVELS)
+CACHE_DIR = "./cache"
+# Memory the shared cache may hold, telemetry sessions run to hundreds of
+# MB each. F1_SESSION_CACHE_MB=0 lifts the limit.
+MAX_BYTES = int(os.environ.get("F1_SESSION_CACHE_MB", 1536)) * 1024 ** 2 or None
+
+_cache_enabled = False
+_cache_lock = threading.Lock()
+
+
+def enable_cache(path=CACHE_DIR):
+    # fastf1's on-disk request cache, the first caller picks the directory.
+    # Anything that reaches fastf1 calls this first, or fastf1 falls back to
+    # its own cache in the user's home directory.
+    global _cache_enabled
+    with _cache_lock:
+        if not _cache_enabled:
+            os.makedirs(path, exist_ok=True)
+            fastf1.Cache.enable_cache(path)
+            _cache_enabled = True
+
+
+def _frame_bytes(frame):
+    try:
+        return int(frame.memory_usage(index=True).sum())
+    except Exception:
+        return 0
+
+
+def session_size(session):
+    size = 0
+
+    for attribute in ("laps", "weather_data"):
+        try:
+            frame = getattr(session, attribute)
+        except Exception:
+            continue
+        if frame is not None:
+            size += _frame_bytes(frame)
+
+    for attribute in ("car_data", "pos_data"):
+        try:
+            channels = getattr(session, attribute)
+        except Exception:
+            continue
+        for frame in (channels or {}).values():
+            size += _frame_bytes(frame)
+
+    return size
+
+
+def load(year, gp, name, data="laps"):
+    if data not in DATA_LEVELS:
+        raise ValueError(
+            f"Unknown data level '{data}', expected one of {LEVEL_ORDER}")
+
+    with profiling.span(f"session.load.{data}"):
+        session = fastf1.get_session(year, gp, name)
+        session.load(**DATA_LEVELS[data])
+    return session
+
+
+class SessionCache:
+    def __init__(self, max_sessions=8, max_bytes=None):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(year, gp, name):
+        return (int(year), str(gp).strip(), str(name).strip())
+
+    def _lookup(self, key, data):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            session, level, _ = entry
+            if LEVEL_ORDER.index(level) < LEVEL_ORDER.index(data):
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return session
+
+    def get(self, year, gp, name, data="laps"):
+        key = self.key(year, gp, name)
+
+        session = self._lookup(key, data)
+        if session is not None:
+            return session
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given session, the others wait for it
+        with key_lock:
+            session = self._lookup(key, data)
+            if session is not None:
+                return session
+
+            with self._lock:
+                self.misses += 1
+
+            session = load(*key, data)
+            self.put(key, session, data)
+            return session
+
+    def put(self, key, session, data):
+        with self._lock:
+            self._entries[key] = (session, data, session_size(session))
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > 1:
+            over_count = self.max_sessions is not None and len(
+                self._entries) > self.max_sessions
+            over_size = self.max_bytes is not None and self._bytes() > self.max_bytes
+            if not (over_count or over_size):
+                break
+
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _bytes(self):
+        return sum(size for _, _, size in self._entries.values())
+
+    def __contains__(self, key):
+        with self._lock:
+            return self.key(*key) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "sessions": len(self._entries),
+                "bytes": self._bytes(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+cache = SessionCache(max_bytes=MAX_BYTES)
+profiling.register("session_cache", cache.stats)
+
+
+def get_session(year, gp, name, data="laps"):
+    return cache.get(year, gp, name, data)
@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import pandas as pd
+import session_cache
+
+# Session loader
+# Loads several sessions of one event at the same time and only parses the
+# data the caller asks for.
+
+PRACTICE_SESSIONS = ["Practice 1", "Practice 2", "Practice 3"]
+
+DATA_LEVELS = session_cache.DATA_LEVELS
+
+
+class SessionResult:
+    def __init__(self, name, session=None, laps=None, elapsed=0.0, error=None):
+        self.name = name
+        self.session = session
+        self.laps = laps if laps is not None else pd.DataFrame()
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        state = "ok" if self.ok else f"error={self.error!r}"
+        return f"SessionResult({self.name!r}, {len(self.laps.index)} laps, {self.elapsed:.2f}s, {state})"
+
+
+def load_session(year, gp, name, data="laps", keep_session=True):
+    if data not in DATA_LEVELS:
+        raise ValueError(
+            f"Unknown data level '{data}', expected one of {list(DATA_LEVELS)}")
+
+    start = time.perf_counter()
+    try:
+        if keep_session:
+            session = session_cache.get_session(year, gp, name, data)
+        else:
+            session = session_cache.load(year, gp, name, data)
+        laps = pd.DataFrame(session.laps)
+    except Exception as error:
+        return SessionResult(name, elapsed=time.perf_counter() - start, error=error)
+
+    return SessionResult(name, session if keep_session else None, laps,
+                         time.perf_counter() - start)
+
+
+def _load_laps_only(year, gp, name, data):
+    # Session objects are not worth sending between processes
+    return load_session(year, gp, name, data, keep_session=False)
+
+
+def load_sessions(year, gp, names, data="laps", workers=None, processes=False,
+                  progress=None):
+    if not names:
+        return []
+
+    workers = workers or len(names)
+
+    if processes:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        target = _load_laps_only
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        target = load_session
+
+    with executor as pool:
+        futures = {pool.submit(target, year, gp, name, data): name
+                   for name in names}
+        results = {}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results[futures[future]] = result
+            if progress is not None:
+                progress(done, len(names), result)
+
+    return [results[name] for name in names]
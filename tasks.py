@@ -0,0 +1,144 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import profiling
+
+# Background tasks
+# Data loads run on worker threads and their results are handed back to the
+# Tk mainloop through a queue, so callbacks always run on the UI thread.
+
+log = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, runner, channel, generation):
+        self.runner = runner
+        self.channel = channel
+        self.generation = generation
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check(self):
+        # Long running work calls this between steps to stop early
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def progress(self, done, total, message=""):
+        if not self.cancelled:
+            self.runner._post(self, "progress", (done, total, message))
+
+
+class TaskRunner:
+    def __init__(self, root, workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="f1-task")
+
+        self._messages = queue.Queue()
+        self._current = {}
+        self._callbacks = {}
+        self._closed = False
+
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, channel, work, *args, on_done=None, on_error=None,
+               on_progress=None, with_task=False, background=False, **kwargs):
+        # A new task on a channel makes the previous one stale
+        self.cancel(channel)
+
+        previous = self._current.get(channel)
+        generation = previous.generation + 1 if previous else 1
+        task = Task(self, channel, generation)
+        self._current[channel] = task
+        self._callbacks[task] = (on_done, on_error, on_progress)
+
+        if with_task:
+            kwargs["task"] = task
+
+        def run():
+            # Every task posts exactly one final message so its callbacks
+            # are released even when it never ran
+            if task.cancelled:
+                self._post(task, "cancelled", None)
+                return
+            try:
+                # Background tasks are left out of action breakdowns
+                with profiling.tagged(f"task:{channel}", background):
+                    result = work(*args, **kwargs)
+            except TaskCancelled:
+                self._post(task, "cancelled", None)
+                return
+            except Exception as error:
+                log.exception("The %s task failed", channel)
+                self._post(task, "error", error)
+            else:
+                self._post(task, "done", result)
+
+        self.executor.submit(run)
+        return task
+
+    def cancel(self, *channels):
+        for channel in channels or list(self._current):
+            task = self._current.get(channel)
+            if task is not None:
+                task.cancel()
+
+    def _post(self, task, kind, payload):
+        self._messages.put((task, kind, payload))
+
+    def _poll(self):
+        if self._closed:
+            return
+
+        try:
+            while True:
+                try:
+                    task, kind, payload = self._messages.get_nowait()
+                except queue.Empty:
+                    break
+                # A failing callback must not stop later results arriving
+                try:
+                    self._deliver(task, kind, payload)
+                except Exception:
+                    log.exception("Callback for the %s task failed", task.channel)
+        finally:
+            self.root.after(self.poll_ms, self._poll)
+
+    def _deliver(self, task, kind, payload):
+        callbacks = self._callbacks.get(task)
+        if callbacks is None:
+            return
+
+        # Results of cancelled or superseded tasks are dropped
+        if kind == "cancelled" or task.cancelled or self._current.get(task.channel) is not task:
+            self._callbacks.pop(task, None)
+            return
+
+        on_done, on_error, on_progress = callbacks
+        if kind == "progress":
+            if on_progress is not None:
+                on_progress(*payload)
+            return
+
+        self._callbacks.pop(task, None)
+        if kind == "done" and on_done is not None:
+            on_done(payload)
+        elif kind == "error" and on_error is not None:
+            on_error(payload)
+
+    def shutdown(self):
+        self._closed = True
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Multi driver telemetry comparison
+# Every driver's fastest lap is resampled onto one shared distance grid with
+# a single interpolation call, so all deltas and mini sectors come out of
+# plain array operations instead of pairwise delta_time calls.
+
+CHANNELS = ["Speed", "Throttle", "Brake", "nGear", "RPM"]
+GRID_STEP = 5.0
+MINI_SECTORS = 25
+
+
+class Comparison:
+    def __init__(self, drivers, reference, grid, channels, time, lap_times=None):
+        self.drivers = drivers
+        self.reference = reference
+        self.grid = grid
+        self.channels = channels
+        self.time = time
+        # Timed lap times, the resampled time stops short of the line
+        self.lap_times = time[:, -1] if lap_times is None else np.where(
+            np.isfinite(lap_times), lap_times, time[:, -1])
+
+    @property
+    def reference_index(self):
+        return self.drivers.index(self.reference)
+
+    @property
+    def delta(self):
+        # Positive means the driver is behind the reference lap
+        return self.time - self.time[self.reference_index]
+
+    def _boundaries(self, sectors):
+        return np.linspace(0, len(self.grid) - 1, sectors + 1).astype(int)
+
+    def sector_times(self, sectors=MINI_SECTORS):
+        return np.diff(self.time[:, self._boundaries(sectors)], axis=1)
+
+    def dominance(self, sectors=MINI_SECTORS):
+        # Index of the quickest driver through each mini sector
+        return np.argmin(self.sector_times(sectors), axis=0)
+
+    def sector_edges(self, sectors=MINI_SECTORS):
+        return self.grid[self._boundaries(sectors)]
+
+    def summary(self, sectors=MINI_SECTORS):
+        wins = np.bincount(self.dominance(sectors), minlength=len(self.drivers))
+        return pd.DataFrame({
+            "Driver": self.drivers,
+            "Reference": self.reference,
+            "LapTime": self.lap_times,
+            "Gap": self.lap_times - self.lap_times[self.reference_index],
+            "TopSpeed": self.channels["Speed"].max(axis=1) if "Speed" in self.channels else np.nan,
+            "MiniSectorsWon": wins,
+        }).sort_values("LapTime", kind="stable").reset_index(drop=True)
+
+
+def lap_telemetry(lap, channels=CHANNELS):
+    car = lap.get_car_data().add_distance()
+    data = {"Distance": car["Distance"].to_numpy(dtype=float),
+            "Time": car["Time"].dt.total_seconds().to_numpy(),
+            "LapTime": pd.Timedelta(lap["LapTime"]).total_seconds() if pd.notna(lap["LapTime"]) else np.nan}
+    for channel in channels:
+        data[channel] = car[channel].to_numpy(dtype=float)
+    return data
+
+
+def fastest_laps(session, drivers, channels=CHANNELS):
+    telemetry = {}
+    for driver in drivers:
+        lap = session.laps.pick_drivers(driver).pick_fastest()
+        if lap is None or len(lap) == 0:
+            continue
+        telemetry[driver] = lap_telemetry(lap, channels)
+    return telemetry
+
+
+def resample(telemetry, step=GRID_STEP, channels=CHANNELS):
+    drivers = list(telemetry)
+    if not drivers:
+        raise ValueError("No telemetry to compare")
+
+    # The grid only covers distance every lap actually reached
+    length = min(data["Distance"][-1] for data in telemetry.values())
+    grid = np.arange(0.0, length, step)
+
+    # Shift every lap to its own distance band so a single np.interp call
+    # resamples all drivers at once. The grid is clipped to each lap's own
+    # samples first, past them the band would reach into the next driver.
+    first = np.array([telemetry[d]["Distance"][0] for d in drivers], dtype=float)
+    last = np.array([telemetry[d]["Distance"][-1] for d in drivers], dtype=float)
+    offset = 10 * step + last.max() - min(first.min(), 0.0)
+    shifts = np.arange(len(drivers)) * offset
+    xp = np.concatenate([telemetry[d]["Distance"] + shift for d, shift in zip(drivers, shifts)])
+    x = (np.clip(grid[None, :], first[:, None], last[:, None]) + shifts[:, None]).ravel()
+
+    def interpolate(channel):
+        fp = np.concatenate([telemetry[d][channel] for d in drivers])
+        return np.interp(x, xp, fp).reshape(len(drivers), len(grid))
+
+    resampled = {channel: interpolate(channel) for channel in channels}
+    time = interpolate("Time")
+    return drivers, grid, resampled, time
+
+
+def compare(telemetry, reference=None, step=GRID_STEP, channels=CHANNELS):
+    drivers, grid, resampled, time = resample(telemetry, step, channels)
+    lapTimes = np.array([float(telemetry[d].get("LapTime", np.nan)) for d in drivers])
+    comparison = Comparison(drivers, None, grid, resampled, time, lapTimes)
+
+    # Without a reference the quickest lap of the selection is used
+    if reference not in drivers:
+        reference = drivers[int(np.argmin(comparison.lap_times))]
+    comparison.reference = reference
+    return comparison
+
+
+def compare_session(session, drivers, reference=None, step=GRID_STEP, channels=CHANNELS):
+    drivers = list(drivers)
+    if reference is not None and reference not in drivers:
+        drivers.append(reference)
+    return compare(fastest_laps(session, drivers, channels), reference, step, channels)
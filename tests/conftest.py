@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The app is a set of flat modules at the repo root, the benchmarks hold the
+# synthetic data the tests share
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
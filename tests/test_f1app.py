@@ -0,0 +1,29 @@
+import f1app
+import season_index
+import session_cache
+import synthetic
+
+
+def schedule(year):
+    # Two rounds in one country, as Italy and the USA have had
+    events = synthetic.season_schedule(year, 3)
+    second = list(events[1])
+    second[1], second[2], second[3] = "Country1 Grand Prix", "Country1 Sprint Grand Prix", "Country1"
+    events[1] = tuple(second)
+    return events
+
+
+def test_all_runs_every_round(monkeypatch):
+    index = season_index.SeasonIndex(":memory:", schedule, synthetic.season_drivers)
+    monkeypatch.setattr(season_index, "_default", index)
+
+    assert list(f1app.events([2022], ["all"])) == [
+        (2022, "Country1 Grand Prix"), (2022, "Country1 Sprint Grand Prix"),
+        (2022, "Country3 Grand Prix")]
+    assert list(f1app.events([2022], ["Bahrain"])) == [(2022, "Bahrain")]
+
+
+def test_no_events(monkeypatch, capsys):
+    monkeypatch.setattr(session_cache, "_cache_enabled", True)
+    assert f1app.main(["predict", "--year", "", "--gp", "Bahrain"]) == 1
+    assert "No events" in capsys.readouterr().err
@@ -0,0 +1,99 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import http_client
+
+DRIVERS = {"MRData": {"DriverTable": {"Drivers": [{"driverId": "max_verstappen", "code": "VER"}]}}}
+
+
+class Stub(BaseHTTPRequestHandler):
+    # Answers with the next queued status, 200 carries the body and an ETag
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+
+        self.send_response(status)
+        if status == 200:
+            body = json.dumps(DRIVERS).encode()
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = HTTPServer(("127.0.0.1", 0), Stub)
+    server.requests = []
+    server.statuses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/api/f1"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(tmp_path, server, monkeypatch):
+    client = http_client.HttpClient(str(tmp_path / "http"), timeout=(1, 2), backoff=0)
+    # What F1_ERGAST_URL points the app at
+    monkeypatch.setattr(http_client, "ERGAST_URL", server.url)
+    monkeypatch.setattr(http_client, "_default", client)
+    yield client
+    client.close()
+
+
+def test_conditional_get(server, client):
+    first = client.get(f"{server.url}/2022/drivers.json")
+    assert not first.from_cache and first.etag == '"v1"'
+
+    server.statuses.append(304)
+    second = client.get(f"{server.url}/2022/drivers.json")
+    assert second.from_cache
+    assert second.json() == DRIVERS
+    assert server.requests[1][1].get("If-None-Match") == '"v1"'
+
+
+def test_fresh_cache_skips_request(server, client):
+    client.get(f"{server.url}/2022/drivers.json")
+    client.get(f"{server.url}/2022/drivers.json", max_age=60)
+    assert len(server.requests) == 1
+
+
+def test_retries_unavailable(server, client):
+    server.statuses.extend([503, 503])
+    assert http_client.ergast("2022/drivers.json") == DRIVERS
+    assert len(server.requests) == 3
+    assert server.requests[0][0] == "/api/f1/2022/drivers.json"
+
+
+def test_gives_up_after_retries(server, client):
+    server.statuses.extend([503] * 4)
+    with pytest.raises(Exception):
+        client.get(f"{server.url}/2022/drivers.json")
+    assert len(server.requests) == 4
+
+
+def test_serves_stale_when_unavailable(server, client):
+    http_client.ergast("2022/drivers.json")
+    server.statuses.extend([503] * 4)
+    stale = client.get(f"{server.url}/2022/drivers.json")
+    assert stale.from_cache and stale.json() == DRIVERS
+
+
+def test_serves_stale_when_offline(server, client):
+    http_client.ergast("2022/drivers.json")
+    server.shutdown()
+    server.server_close()
+    assert http_client.ergast("2022/drivers.json") == DRIVERS
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import f1app  # noqa: E402
+import lap_store  # noqa: E402
+import session_cache  # noqa: E402
+from synthetic import practice_laps  # noqa: E402
+
+
+def event_laps(session, seed=0, year=2022, round=1, name="Bahrain Grand Prix",
+               country="Bahrain", location="Sakhir"):
+    laps = practice_laps(200, seed=seed)
+    laps["Time"] = laps["LapTime"].cumsum()
+    laps["LapNumber"] = laps.groupby("Driver").cumcount().astype(float) + 1
+    laps["Year"] = year
+    laps["Round"] = round
+    laps["EventName"] = name
+    laps["Country"] = country
+    laps["GP"] = f"{country} Grand Prix"
+    laps["Location"] = location
+    laps["Session"] = session
+    return laps
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = lap_store.LapStore(str(tmp_path / "laps"))
+    for i, name in enumerate(("Practice 1", "Practice 2", "Practice 3")):
+        store.write(event_laps(name, seed=i))
+    return store
+
+
+def test_round_trip(store):
+    written = event_laps("Practice 2", seed=1)
+    laps = store.query(year=2022, session="Practice 2")
+
+    assert len(laps.index) == len(written.index)
+    laps = laps.sort_values("Time").reset_index(drop=True)
+    for column in ("Driver", "Compound"):
+        assert list(laps[column]) == list(written[column])
+    for column in ("Time", "LapTime", "Sector1Time", "Sector2Time", "Sector3Time"):
+        pd.testing.assert_series_equal(laps[column], written[column], check_dtype=False)
+
+
+def test_rewrite_replaces_partition(store):
+    store.write(event_laps("Practice 1", seed=5).head(10))
+    assert len(store.query(session="Practice 1").index) == 10
+    assert len(store.query(session="Practice 3").index) == 200
+
+
+@pytest.mark.parametrize("gp", ["Bahrain", "bahrain", "Sakhir", "Bahrain Grand Prix"])
+def test_gp_spellings(store, gp):
+    laps = store.query(year=2022, gp=gp)
+    assert len(laps.index) == 600
+
+
+def test_two_events_at_one_venue(tmp_path):
+    store = lap_store.LapStore(str(tmp_path / "laps"))
+    store.write(event_laps("Race", seed=1, year=2020, round=1, name="Austrian Grand Prix",
+                           country="Austria", location="Spielberg"))
+    store.write(event_laps("Race", seed=2, year=2020, round=2, name="Styrian Grand Prix",
+                           country="Austria", location="Spielberg"))
+
+    assert list(store.events()["Round"]) == [1, 2]
+    styrian = store.query(year=2020, gp="Styrian Grand Prix")
+    assert len(styrian.index) == 200 and set(styrian["Round"]) == {2}
+    with pytest.raises(ValueError):
+        store.query(year=2020, gp="Spielberg")
+
+
+def test_ambiguous_gp_label(tmp_path):
+    store = lap_store.LapStore(str(tmp_path / "laps"))
+    store.write(event_laps("Practice 1", year=2022, round=4, name="Emilia Romagna Grand Prix",
+                           country="Italy", location="Imola"))
+    store.write(event_laps("Practice 1", year=2022, round=16, name="Italian Grand Prix",
+                           country="Italy", location="Monza"))
+
+    with pytest.raises(ValueError):
+        store.query(year=2022, gp="Italy Grand Prix")
+    assert set(store.query(year=2022, gp="Monza")["Round"]) == {16}
+    assert set(store.query(year=2022, gp="emilia romagna grand prix")["Round"]) == {4}
+
+
+def test_unknown_gp(store):
+    assert len(store.query(year=2022, gp="Monaco").index) == 0
+
+
+def test_cli_reads_store(store, monkeypatch, tmp_path):
+    # python -m f1app predict --year 2022 --gp Bahrain --store ...
+    def load(*args, **kwargs):
+        raise AssertionError("fell back to a fastf1 load")
+
+    monkeypatch.setattr(session_cache, "load", load)
+    monkeypatch.setattr(session_cache, "get_session", load)
+    monkeypatch.setattr(session_cache, "_cache_enabled", True)
+
+    result = f1app.run_event("predict", 2022, "Bahrain",
+                             {"store": store.root, "cache": str(tmp_path)})
+    assert len(result.index) > 0
+    assert set(result["GP"]) == {"Bahrain"}
@@ -0,0 +1,57 @@
+import fastf1
+import pandas as pd
+
+import live
+import session_cache
+
+START = pd.Timestamp("2022-03-18 12:00", tz="UTC")
+
+
+class FakeSession:
+    def __init__(self, laps):
+        self.laps = laps
+        self.date = START
+
+
+def lap(driver, number):
+    seconds = 30.0 - number
+    return {"Driver": driver, "LapNumber": float(number), "IsAccurate": True,
+            "Sector1Time": pd.Timedelta(seconds=seconds), "Sector2Time": pd.Timedelta(seconds=seconds),
+            "Sector3Time": pd.Timedelta(seconds=seconds)}
+
+
+def test_practice_fetcher_sees_new_laps(monkeypatch):
+    timing = [[lap("VER", 1), lap("HAM", 1)]]
+    cached = []
+
+    def load(year, gp, name, data="laps"):
+        cached.append(fastf1.Cache._tmp_disabled)
+        return FakeSession(pd.DataFrame(timing[-1]))
+
+    monkeypatch.setattr(session_cache, "load", load)
+    clock = [START + pd.Timedelta(minutes=10)]
+    fetcher = live.PracticeFetcher(2022, "Bahrain", ["Practice 1"], now=lambda: clock[0])
+    source = live.PollingSource(fetcher)
+    predictor = live.LivePredictor()
+
+    first = source.poll()
+    assert len(first.index) == 2
+    predictor.feed(first)
+    # Nothing new on the timing screens, nothing handed on
+    assert len(source.poll().index) == 0
+
+    timing.append(timing[-1] + [lap("VER", 2)])
+    batch = source.poll()
+    assert list(zip(batch["Driver"], batch["LapNumber"])) == [("VER", 2.0)]
+    assert predictor.feed(batch) == {"VER"}
+
+    # Every load skipped fastf1's request cache, which is back on afterwards
+    assert cached == [True, True, True]
+    assert not fastf1.Cache._tmp_disabled
+
+    # Once the session is over it is loaded a last time and then left alone
+    clock[0] = START + pd.Timedelta(hours=2)
+    source.poll()
+    assert fetcher.finished
+    source.poll()
+    assert len(cached) == 4
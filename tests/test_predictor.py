@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+import predictor
+from bench_predictor import legacy_predict
+from synthetic import DRIVER_CODES, practice_weekend
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_legacy_loop(seed):
+    practices = practice_weekend(300, seed=seed)
+
+    legacy = legacy_predict(practices, DRIVER_CODES)
+    result = predictor.predict(practices, DRIVER_CODES)
+
+    assert list(result.index) == [driver for driver, _ in legacy]
+    assert list(result["IdealLap"]) == [laptime for _, laptime in legacy]
+
+
+def test_roster_and_missing_sessions():
+    practices = practice_weekend(300)
+    practices[1] = None
+    drivers = ["VER", "HAM", "XXX"]
+
+    legacy = legacy_predict([p for p in practices if p is not None], drivers)
+    result = predictor.predict(practices, drivers)
+
+    assert list(result.index) == [driver for driver, _ in legacy]
+    assert "XXX" not in result.index
+
+
+def test_sectors_add_up():
+    result = predictor.predict(practice_weekend(300))
+    total = result[predictor.SECTORS].sum(axis=1)
+    pd.testing.assert_series_equal(total, result["IdealLap"], check_names=False)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        predictor.predict(practice_weekend(50), method="fastest")
@@ -0,0 +1,28 @@
+import threading
+
+import profiling
+
+
+def test_background_spans_left_out_of_actions():
+    recorder = profiling.Recorder()
+
+    def prefetch():
+        with recorder.tagged("prefetch", background=True):
+            with recorder.span("session.load"):
+                pass
+            recorder.count("session_cache.miss")
+
+    token = recorder.begin("predict")
+    with recorder.span("predict"):
+        worker = threading.Thread(target=prefetch)
+        worker.start()
+        worker.join()
+    breakdown = recorder.end(token)
+
+    assert set(breakdown["spans"]) == {"predict"}
+    assert "session_cache.miss" not in breakdown["counters"]
+
+    # The totals still hold everything, by the tag that recorded it
+    snapshot = recorder.snapshot()
+    assert set(snapshot["spans"]) == {"predict", "session.load"}
+    assert set(snapshot["tags"]) == {threading.current_thread().name, "prefetch"}
@@ -0,0 +1,38 @@
+import pytest
+
+import season_index
+import synthetic
+
+
+def offline(year):
+    raise ConnectionError("offline")
+
+
+def test_first_offline_run_uses_cached_schedule():
+    online = []
+
+    def fetch_schedule(year):
+        return synthetic.season_schedule(year, 3) if online else offline(year)
+
+    def fetch_drivers(year):
+        return synthetic.season_drivers(year) if online else offline(year)
+
+    index = season_index.SeasonIndex(
+        ":memory:", fetch_schedule, fetch_drivers,
+        fetch_cached=lambda year: synthetic.season_schedule(year, 2))
+    races, drivers = index.season(2022)
+    assert len(races) == 2
+    assert drivers == []
+
+    # The fallback is stale, the next lookup goes back to the network
+    online.append(True)
+    races, drivers = index.season(2022)
+    assert len(races) == 3
+    assert drivers
+
+
+def test_first_offline_run_without_cache_raises():
+    index = season_index.SeasonIndex(
+        ":memory:", offline, offline, fetch_cached=lambda year: [])
+    with pytest.raises(ConnectionError):
+        index.season(2022)
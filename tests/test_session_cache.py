@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import session_cache
+
+
+class FakeSession:
+    def __init__(self, key, data, rows=10):
+        self.key = key
+        self.data = data
+        self.laps = pd.DataFrame({"LapNumber": range(rows)})
+        if data != "laps":
+            # A channel frame per driver, as fastf1 holds car data
+            self.car_data = {driver: pd.DataFrame({"Speed": np.zeros(rows * 100)})
+                             for driver in ("VER", "HAM")}
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    loads = []
+
+    def load(year, gp, name, data="laps"):
+        loads.append((year, gp, name, data))
+        return FakeSession((year, gp, name), data)
+
+    monkeypatch.setattr(session_cache, "load", load)
+    return loads
+
+
+def test_hits_skip_loading(loads):
+    cache = session_cache.SessionCache()
+    first = cache.get(2022, "Bahrain Grand Prix", "Race")
+    assert cache.get(2022, " Bahrain Grand Prix ", "Race") is first
+    assert len(loads) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_evicts_least_recently_used(loads):
+    cache = session_cache.SessionCache(max_sessions=2)
+    cache.get(2022, "Bahrain Grand Prix", "Practice 1")
+    cache.get(2022, "Bahrain Grand Prix", "Practice 2")
+    # Practice 1 is used again, so Practice 2 is the one to go
+    cache.get(2022, "Bahrain Grand Prix", "Practice 1")
+    cache.get(2022, "Bahrain Grand Prix", "Practice 3")
+
+    assert (2022, "Bahrain Grand Prix", "Practice 1") in cache
+    assert (2022, "Bahrain Grand Prix", "Practice 2") not in cache
+    assert (2022, "Bahrain Grand Prix", "Practice 3") in cache
+    assert cache.evictions == 1
+
+
+def test_evicts_by_size(loads):
+    size = session_cache.session_size(FakeSession(None, "laps"))
+    cache = session_cache.SessionCache(max_sessions=None, max_bytes=int(size * 2.5))
+    for name in ("Practice 1", "Practice 2", "Practice 3"):
+        cache.get(2022, "Bahrain Grand Prix", name)
+
+    assert len(cache) == 2
+    assert (2022, "Bahrain Grand Prix", "Practice 1") not in cache
+
+
+def test_keeps_a_session_larger_than_the_budget(loads):
+    cache = session_cache.SessionCache(max_bytes=1)
+    cache.get(2022, "Bahrain Grand Prix", "Race")
+    assert len(cache) == 1
+
+
+def test_more_data_reloads(loads):
+    cache = session_cache.SessionCache()
+    cache.get(2022, "Bahrain Grand Prix", "Race", data="car_data")
+    # Telemetry covers a laps request, not the other way round
+    cache.get(2022, "Bahrain Grand Prix", "Race", data="laps")
+    assert len(loads) == 1
+
+    cache.get(2022, "Bahrain Grand Prix", "Race", data="full")
+    assert [data for *_, data in loads] == ["car_data", "full"]
+    assert len(cache) == 1
+
+
+def test_shared_cache_is_bounded_by_memory(loads):
+    assert session_cache.cache.max_bytes == session_cache.MAX_BYTES
+    assert session_cache.MAX_BYTES is not None
+
+    # Car data dominates the size, a budget of two telemetry sessions keeps
+    # two even though the count limit would allow eight
+    size = session_cache.session_size(FakeSession(None, "car_data"))
+    assert size > 16000
+    cache = session_cache.SessionCache(max_sessions=8, max_bytes=size * 2)
+    for name in ("Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"):
+        cache.get(2022, "Bahrain Grand Prix", name, data="car_data")
+
+    assert len(cache) == 2
+    assert cache.stats()["bytes"] <= size * 2
+    assert (2022, "Bahrain Grand Prix", "Race") in cache
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+import tasks
+
+
+class FakeRoot:
+    # Stands in for the Tk root, after() callbacks run when pumped
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self):
+        pending, self.pending = self.pending, []
+        for callback in pending:
+            callback()
+
+
+def drain(root, until, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not until():
+        assert time.monotonic() < deadline, "task never finished"
+        root.pump()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def runner():
+    root = FakeRoot()
+    runner = tasks.TaskRunner(root, poll_ms=1)
+    yield runner
+    runner.shutdown()
+
+
+def test_delivers_result_on_poll(runner):
+    results = []
+    runner.submit("predict", lambda a, b: a + b, 1, 2, on_done=results.append)
+
+    drain(runner.root, lambda: results)
+    assert results == [3]
+    assert not runner._callbacks
+
+
+def test_delivers_errors_and_progress(runner):
+    progress = []
+    errors = []
+
+    def work(task):
+        task.progress(1, 2, "half")
+        raise ValueError("bad data")
+
+    runner.submit("predict", work, with_task=True, on_error=errors.append,
+                  on_progress=lambda *args: progress.append(args))
+
+    drain(runner.root, lambda: errors)
+    assert progress == [(1, 2, "half")]
+    assert isinstance(errors[0], ValueError)
+
+
+def test_newer_task_supersedes(runner):
+    release = threading.Event()
+    results = []
+
+    runner.submit("telemetry", lambda: release.wait(5) and "old", on_done=results.append)
+    runner.submit("telemetry", lambda: "new", on_done=results.append)
+    release.set()
+
+    drain(runner.root, lambda: results and not runner._callbacks)
+    assert results == ["new"]
+
+
+def test_cancel_releases_callbacks(runner):
+    started = threading.Event()
+    results = []
+
+    def work(task):
+        started.set()
+        while True:
+            task.check()
+            time.sleep(0.001)
+
+    task = runner.submit("degradation", work, with_task=True, on_done=results.append)
+    started.wait(5)
+    runner.cancel("degradation")
+    assert task.cancelled
+
+    drain(runner.root, lambda: not runner._callbacks)
+    assert results == []
+
+
+def test_failing_callback_keeps_polling(runner):
+    results = []
+
+    def fail(result):
+        raise RuntimeError("callback failed")
+
+    runner.submit("season", lambda: 1, on_done=fail)
+    drain(runner.root, lambda: not runner._callbacks)
+    runner.submit("modules", lambda: 2, on_done=results.append)
+
+    drain(runner.root, lambda: results)
+    assert results == [2]
+    assert runner.root.pending
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+import telemetry
+
+
+def lap(start, end, speed, lap_time, samples=200):
+    distance = np.linspace(start, end, samples)
+    return {"Distance": distance,
+            "Time": (distance - start) / speed,
+            "LapTime": lap_time,
+            **{channel: np.full(samples, float(speed)) for channel in telemetry.CHANNELS}}
+
+
+def test_grid_stops_at_the_shortest_lap():
+    drivers, grid, _, _ = telemetry.resample(
+        {"VER": lap(0, 5000, 100, 50.5), "HAM": lap(0, 4800, 90, 54.0)})
+    assert drivers == ["VER", "HAM"]
+    assert grid[0] == 0 and grid[-1] < 4800
+
+
+def test_edges_stay_in_each_lap():
+    # Laps that start past zero and end at different distances must not
+    # pick up samples of the driver next to them
+    data = {"VER": lap(3, 5000, 100, 50.5), "HAM": lap(8, 5300, 80, 66.2),
+            "LEC": lap(1, 4900, 60, 82.0)}
+    drivers, grid, resampled, time = telemetry.resample(data)
+
+    for row, driver in enumerate(drivers):
+        speed = data[driver]["Speed"][0]
+        assert np.all(resampled["Speed"][row] == speed)
+        assert time[row, 0] == 0
+        assert np.all(np.diff(time[row]) >= 0)
+
+
+def test_compare_uses_timed_lap_times():
+    comparison = telemetry.compare(
+        {"VER": lap(0, 5000, 100, 50.5), "HAM": lap(0, 5000, 90, 56.1)})
+    assert comparison.reference == "VER"
+
+    summary = comparison.summary()
+    assert list(summary["Driver"]) == ["VER", "HAM"]
+    assert list(summary["LapTime"]) == [50.5, 56.1]
+    assert summary["Gap"].tolist() == pytest.approx([0.0, 5.6])
+
+
+def test_nothing_to_compare():
+    with pytest.raises(ValueError):
+        telemetry.resample({})
@@ -0,0 +1,193 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+import matplotlib
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import BoundaryNorm, ListedColormap, Normalize
+import plotting
+import telemetry
+
+# Track map
+# The racing line drawn from position data as one LineCollection, coloured
+# by speed, gear or the fastest driver of every mini-sector. A circuit's
+# geometry and its mini-sector split are built once from a reference lap
+# and cached in memory and on disk, later laps only recolour the segments.
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "circuits")
+GRID_STEP = telemetry.GRID_STEP
+MINI_SECTORS = telemetry.MINI_SECTORS
+# Map mode -> telemetry channel it colours by
+MODES = {"Speed": "Speed", "Gear": "nGear", "Fastest": None}
+GEAR_COLORS = ["#3A0CA3", "#4361EE", "#4CC9F0", "#8AC926",
+               "#FFBE0B", "#FB5607", "#FF006E", "#E5383B"]
+
+
+class CircuitGeometry:
+    def __init__(self, distance, x, y, rotation=0.0, sectors=MINI_SECTORS):
+        self.distance = np.asarray(distance, dtype=float)
+        self.raw = (np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        self.rotation = float(rotation)
+        self.sectors = sectors
+
+        # Rotated so the map matches the usual orientation of the circuit
+        angle = np.deg2rad(self.rotation)
+        cos, sin = np.cos(angle), np.sin(angle)
+        self.x = self.raw[0] * cos - self.raw[1] * sin
+        self.y = self.raw[0] * sin + self.raw[1] * cos
+
+        points = np.column_stack([self.x, self.y])
+        self.segments = np.stack([points[:-1], points[1:]], axis=1)
+        self.midpoints = (self.distance[:-1] + self.distance[1:]) / 2
+        self.length = self.distance[-1]
+        self.segment_sector = np.minimum(
+            (self.midpoints / self.length * sectors).astype(int), sectors - 1)
+
+    @classmethod
+    def from_lap(cls, lapTelemetry, rotation=0.0, step=GRID_STEP, sectors=MINI_SECTORS):
+        distance = lapTelemetry["Distance"].to_numpy(dtype=float)
+        valid = np.isfinite(distance) & lapTelemetry["X"].notna().to_numpy() & \
+            lapTelemetry["Y"].notna().to_numpy()
+        distance = distance[valid]
+
+        grid = np.arange(0.0, distance[-1], step)
+        x = np.interp(grid, distance, lapTelemetry["X"].to_numpy(dtype=float)[valid])
+        y = np.interp(grid, distance, lapTelemetry["Y"].to_numpy(dtype=float)[valid])
+        return cls(grid, x, y, rotation, sectors)
+
+    @classmethod
+    def from_session(cls, session, step=GRID_STEP, sectors=MINI_SECTORS):
+        # The fastest lap is the cleanest line through the circuit
+        lap = session.laps.pick_fastest()
+        try:
+            rotation = session.get_circuit_info().rotation
+        except Exception:
+            rotation = 0.0
+        return cls.from_lap(lap.get_telemetry(), rotation, step, sectors)
+
+    def values(self, distance, values, discrete=False):
+        # A lap's channel on the segments, matched by the fraction of the lap
+        # covered since every lap measures a slightly different length
+        distance = np.asarray(distance, dtype=float)
+        values = np.asarray(values, dtype=float)
+        position = self.midpoints / self.length * distance[-1]
+        if discrete:
+            # Gears are not interpolated, each segment keeps the last sample
+            index = np.searchsorted(distance, position, side="right") - 1
+            return values[np.clip(index, 0, len(values) - 1)]
+        return np.interp(position, distance, values)
+
+    def sector_values(self, sectorValues):
+        return np.asarray(sectorValues)[self.segment_sector]
+
+    def save(self, path):
+        np.savez(path, distance=self.distance, x=self.raw[0], y=self.raw[1],
+                 rotation=self.rotation, sectors=self.sectors)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["distance"], data["x"], data["y"],
+                       float(data["rotation"]), int(data["sectors"]))
+
+
+class GeometryCache:
+    def __init__(self, path=DEFAULT_CACHE_DIR, max_circuits=16):
+        self.path = path
+        self.max_circuits = max_circuits
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _file(self, key):
+        name = re.sub(r"[^A-Za-z0-9]+", "_", "_".join(str(part) for part in key))
+        return os.path.join(self.path, f"{name}.npz")
+
+    def get(self, key, build):
+        with self._lock:
+            geometry = self._entries.get(key)
+            if geometry is not None:
+                self._entries.move_to_end(key)
+                return geometry
+
+        path = self._file(key)
+        if os.path.exists(path):
+            geometry = CircuitGeometry.load(path)
+        else:
+            geometry = build()
+            os.makedirs(self.path, exist_ok=True)
+            geometry.save(path)
+
+        with self._lock:
+            self._entries[key] = geometry
+            while len(self._entries) > self.max_circuits:
+                self._entries.popitem(last=False)
+        return geometry
+
+
+cache = GeometryCache()
+
+
+class TrackMapPlot:
+    def __init__(self, master, theme):
+        foreground = theme["text.color"]
+
+        self.figure, self.ax = plotting.themed_figure(theme, (12, 6.8))
+        self.ax.set_aspect("equal")
+        self.ax.axis("off")
+
+        self.collection = LineCollection([], linewidths=4, capstyle="round")
+        self.collection.set_array(np.zeros(0))
+        self.ax.add_collection(self.collection)
+        with matplotlib.rc_context(theme):
+            self.colorbar = self.figure.colorbar(
+                self.collection, ax=self.ax, fraction=0.03, pad=0.02, panchor=False)
+            self.title = self.ax.set_title("", color=foreground)
+        self.colorbar.ax.tick_params(colors=foreground)
+        self.colorbar.outline.set_edgecolor(foreground)
+
+        self.canvas = plotting.FigureCanvasTkAgg(self.figure, master)
+        self._geometry = None
+
+    def widget(self):
+        return self.canvas.get_tk_widget()
+
+    def _set_geometry(self, geometry):
+        # Segments only change with the circuit
+        if geometry is self._geometry:
+            return
+        self._geometry = geometry
+        self.collection.set_segments(geometry.segments)
+
+        margin = 0.05 * max(np.ptp(geometry.x), np.ptp(geometry.y))
+        self.ax.set_xlim(geometry.x.min() - margin, geometry.x.max() + margin)
+        self.ax.set_ylim(geometry.y.min() - margin, geometry.y.max() + margin)
+
+    def update(self, geometry, values, mode, drivers, colors=None):
+        self._set_geometry(geometry)
+        self.collection.set_array(values)
+
+        if mode == "Fastest":
+            count = len(drivers)
+            self.collection.set_cmap(ListedColormap(colors))
+            self.collection.set_norm(BoundaryNorm(np.arange(count + 1) - 0.5, count))
+            ticks, labels = range(count), drivers
+            title = "Fastest driver per mini-sector"
+        elif mode == "Gear":
+            self.collection.set_cmap(ListedColormap(GEAR_COLORS))
+            self.collection.set_norm(BoundaryNorm(np.arange(len(GEAR_COLORS) + 1) + 0.5,
+                                                  len(GEAR_COLORS)))
+            ticks = range(1, len(GEAR_COLORS) + 1)
+            labels = [str(gear) for gear in ticks]
+            title = f"{drivers[0]} gear"
+        else:
+            self.collection.set_cmap("plasma")
+            self.collection.set_norm(Normalize(np.nanmin(values), np.nanmax(values)))
+            ticks, labels = None, None
+            title = f"{drivers[0]} speed in km/h"
+
+        self.colorbar.update_normal(self.collection)
+        if ticks is not None:
+            self.colorbar.set_ticks(list(ticks), labels=list(labels))
+        self.title.set_text(title)
+        self.canvas.draw_idle()